@@ -0,0 +1,20 @@
+import pytest
+
+import hometask_core
+from hometask_dedup import close_dedup_indexes
+from hometask_feed import configure_rotation
+from hometask_feedlock import close_feed_writers
+
+
+@pytest.fixture
+def feed_dir(tmp_path, monkeypatch):
+    """Run in an empty directory; shared handles on its files are closed afterwards."""
+    monkeypatch.chdir(tmp_path)
+    hometask_core.TEXT_CACHE.clear()
+    yield tmp_path
+    import hometask_db
+    hometask_db.close_db_handler()
+    close_dedup_indexes()
+    close_feed_writers()
+    configure_rotation()
+    hometask_core.TEXT_CACHE.clear()
@@ -0,0 +1,397 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from hometask_datagen import CITIES, WORDS, InputRecordGenerator, write_input_file
+from hometask_dedup import close_dedup_indexes
+from hometask_feedlock import close_feed_writers
+
+
+# =========================
+# DETERMINISTIC DATA GENERATORS
+# =========================
+# Input records and files come from hometask_datagen; record types there
+# are randomly cased, as users type them.
+
+def generate_input_records(count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Reproducible list of input records (lower-case keys, as in the JSON format)."""
+    return InputRecordGenerator(seed).batch(count)
+
+
+def _kind(record: Dict[str, str]) -> str:
+    return record["type"].lower()
+
+
+def write_feed(path: str, records: List[Dict[str, str]]):
+    """Write records directly in the published news_feed.txt format."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i, rec in enumerate(records):
+            if _kind(rec) == "news":
+                f.write(f"News -------------------------\n{rec['text']}\n{rec['city']}, 2030-01-01 09:00\n\n")
+            elif _kind(rec) == "ad":
+                f.write(f"Private Ad -------------------\n{rec['text']}\n"
+                        f"Expires: {rec['expires']}, 10 days left\n\n")
+            else:
+                f.write(f"Event ------------------------\nEvent: {rec['name']}\n"
+                        f"Location: {rec['location']}\nTime: {rec['time']}\nEvent Code: {i:08x}\n\n")
+
+
+# =========================
+# BENCHMARKS
+# =========================
+# Every benchmark prepares its inputs in a fresh working directory and
+# returns the seconds spent in the hot path only.
+
+def _clear_text_cache():
+    """Start every run cold; repeats would otherwise only measure cache hits."""
+    from hometask_core import TEXT_CACHE
+    TEXT_CACHE.clear()
+
+
+@contextlib.contextmanager
+def _workdir():
+    _clear_text_cache()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="hometask_bench_") as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                yield tmp
+        finally:
+            close_dedup_indexes()
+            close_feed_writers()
+            os.chdir(cwd)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_process_text(scale: int, seed: int) -> float:
+    import hometask_json
+    texts = [rec.get("text") or rec["name"] for rec in generate_input_records(scale, seed)]
+    _clear_text_cache()
+    return _timed(lambda: [hometask_json.process_text(t) for t in texts])
+
+
+def bench_process_text_summary(scale: int, seed: int) -> float:
+    import hometask_xml
+    texts = [rec.get("text") or rec["name"] for rec in generate_input_records(scale, seed)]
+    _clear_text_cache()
+    return _timed(lambda: [hometask_xml.process_text(t) for t in texts])
+
+
+def bench_normalize_repeated(scale: int, seed: int) -> float:
+    """Normalize the fields of `scale` records whose texts come from a small boilerplate pool."""
+    import hometask_json
+    from hometask_records import build_record
+    records = generate_input_records(scale, seed)
+    boilerplate = [rec.get("text") or rec["name"] for rec in records[:max(1, scale // 50)]]
+    rng = random.Random(seed)
+    for rec in records:
+        rec["text" if "text" in rec else "name"] = rng.choice(boilerplate)
+    typed = [build_record(rec) for rec in records]
+    normalize = hometask_json.FileRecordProcessor._normalize_text_fields
+    _clear_text_cache()
+    return _timed(lambda: [normalize(None, rec) for rec in typed])
+
+
+def bench_generate_statistics(scale: int, seed: int) -> float:
+    import hometask_json
+    with _workdir():
+        write_feed("news_feed.txt", generate_input_records(scale, seed))
+        return _timed(lambda: hometask_json.generate_statistics("news_feed.txt"))
+
+
+def bench_update_csvs(scale: int, seed: int) -> float:
+    import hometask_xml
+    with _workdir():
+        write_feed("news_feed.txt", generate_input_records(scale, seed))
+        return _timed(lambda: hometask_xml.update_csvs("news_feed.txt"))
+
+
+def bench_text_processor(scale: int, seed: int) -> float:
+    import hometask_json
+    with _workdir():
+        write_input_file("records.txt", generate_input_records(scale, seed), "text")
+        return _timed(lambda: hometask_json.FileRecordProcessor("records.txt").process_file())
+
+
+def bench_json_processor(scale: int, seed: int) -> float:
+    import hometask_json
+    with _workdir():
+        write_input_file("records.json", generate_input_records(scale, seed), "json")
+        return _timed(lambda: hometask_json.JsonRecordProcessor("records.json").process_file())
+
+
+def bench_json_file_input(scale: int, seed: int) -> float:
+    import hometask_xml
+    with _workdir():
+        write_input_file("records.json", generate_input_records(scale, seed), "json")
+        return _timed(lambda: hometask_xml.JSONFileInput().process_file("records.json"))
+
+
+def bench_xml_file_input(scale: int, seed: int) -> float:
+    import hometask_xml
+    with _workdir():
+        write_input_file("records.xml", generate_input_records(scale, seed), "xml")
+        return _timed(lambda: hometask_xml.XMLFileInput().process_file("records.xml"))
+
+
+def bench_db_inserts(scale: int, seed: int) -> float:
+    records = generate_input_records(scale, seed)
+    with _workdir():
+        import hometask_db
+        db = hometask_db.DatabaseHandler("bench.db")
+
+        def run():
+            for rec in records:
+                if _kind(rec) == "news":
+                    db.insert_news(rec["text"], rec["city"], "2030-01-01 09:00")
+                elif _kind(rec) == "ad":
+                    db.insert_private_ad(rec["text"], rec["expires"], 10)
+                else:
+                    db.insert_event(rec["name"], rec["location"], rec["time"], "00000000")
+        return _timed(run)
+
+
+def bench_db_inserts_write_behind(scale: int, seed: int) -> float:
+    """Same inserts through the write-behind queue, including the final drain."""
+    records = generate_input_records(scale, seed)
+    with _workdir():
+        import hometask_db
+        db = hometask_db.DatabaseHandler("bench.db", write_behind=True)
+
+        def run():
+            for rec in records:
+                if _kind(rec) == "news":
+                    db.insert_news(rec["text"], rec["city"], "2030-01-01 09:00")
+                elif _kind(rec) == "ad":
+                    db.insert_private_ad(rec["text"], rec["expires"], 10)
+                else:
+                    db.insert_event(rec["name"], rec["location"], rec["time"], "00000000")
+            db.close()
+        return _timed(run)
+
+
+def bench_event_codes(scale: int, seed: int) -> float:
+    """`scale` event codes one at a time from a fresh generator."""
+    from hometask_codes import EventCodeGenerator
+    generator = EventCodeGenerator()
+    return _timed(lambda: [generator.next_code() for _ in range(scale)])
+
+
+def _search_db(scale: int, seed: int) -> List[str]:
+    """Fill bench.db with `scale` records (FTS kept in sync by the triggers); returns the queries."""
+    import hometask_db
+    hometask_db.DatabaseHandler("bench.db")
+    records = generate_input_records(scale, seed)
+    with hometask_db.DatabaseHandler("bench.db")._connect() as conn:
+        conn.executemany("INSERT INTO news (text, city, date) VALUES (?, ?, '2030-01-01 09:00')",
+                         [(r["text"], r["city"]) for r in records if _kind(r) == "news"])
+        conn.executemany("INSERT INTO private_ads (text, exp_date, days_left) VALUES (?, ?, 10)",
+                         [(r["text"], r["expires"]) for r in records if _kind(r) == "ad"])
+        conn.executemany("INSERT INTO events (name, location, time, event_code) VALUES (?, ?, ?, '00000000')",
+                         [(r["name"], r["location"], r["time"]) for r in records if _kind(r) == "event"])
+    rng = random.Random(seed)
+    # Rare terms (one record number) make LIKE scan everything; common word pairs match many rows.
+    rare = [str(rng.randrange(scale)) for _ in range(10)]
+    common = [f"{rng.choice(WORDS)} {rng.choice(CITIES)}" for _ in range(10)]
+    return rare + common
+
+
+def _bench_search(scale: int, seed: int, like: bool) -> float:
+    with _workdir():
+        queries = _search_db(scale, seed)
+        from hometask_queries import FeedQueries
+        q = FeedQueries("bench.db")
+        search = q.search_like if like else q.search
+        try:
+            return _timed(lambda: [search(query, 20) for query in queries])
+        finally:
+            q.close()
+
+
+def bench_search_fts(scale: int, seed: int) -> float:
+    """20 ranked FTS5 searches over `scale` DB records."""
+    return _bench_search(scale, seed, like=False)
+
+
+def bench_search_like(scale: int, seed: int) -> float:
+    """The same 20 searches as LIKE scans."""
+    return _bench_search(scale, seed, like=True)
+
+
+BENCHMARKS: Dict[str, Callable[[int, int], float]] = {
+    "text.process_text": bench_process_text,
+    "text.process_text_summary": bench_process_text_summary,
+    "text.normalize_repeated": bench_normalize_repeated,
+    "stats.generate_statistics": bench_generate_statistics,
+    "stats.update_csvs": bench_update_csvs,
+    "ingest.text_file": bench_text_processor,
+    "ingest.json_file": bench_json_processor,
+    "ingest.json_file_input": bench_json_file_input,
+    "ingest.xml_file_input": bench_xml_file_input,
+    "db.inserts": bench_db_inserts,
+    "db.inserts_write_behind": bench_db_inserts_write_behind,
+    "codes.event_codes": bench_event_codes,
+    "search.fts": bench_search_fts,
+    "search.like": bench_search_like,
+}
+
+DEFAULT_SCALES = [100, 1000, 10000]
+
+IMPORT_MODULES = ["hometask_cli", "hometask_db", "hometask_xml", "hometask_json",
+                  "hometask_csvparsing", "hometask_modulesfiles"]
+
+
+def measure_import(module: str) -> float:
+    """Seconds spent importing `module` in a fresh interpreter (-X importtime cumulative)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    # The first run refreshes __pycache__, so compiling the source is not measured.
+    subprocess.run(cmd, capture_output=True, env=env, cwd=tempfile.gettempdir(), check=True)
+    out = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=tempfile.gettempdir(), check=True)
+    for line in out.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1_000_000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def run_import_benchmarks(modules: List[str] | None = None, repeat: int = 5) -> Dict:
+    """Cold-start import cost per front-end module, in the run_benchmarks format."""
+    results = []
+    for module in modules or IMPORT_MODULES:
+        runs = [measure_import(module) for _ in range(repeat)]
+        best = min(runs)
+        results.append({
+            "bench": f"import.{module}",
+            "scale": 1,
+            "best_s": round(best, 6),
+            "median_s": round(statistics.median(runs), 6),
+            "per_record_us": round(best * 1_000_000, 3),
+            "records_per_sec": None,
+        })
+        print(f"import {module:24s} best {best * 1000:8.2f}ms  median {statistics.median(runs) * 1000:8.2f}ms")
+    return {"meta": _meta(None, repeat), "results": results}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _meta(seed: int | None, repeat: int) -> Dict:
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run_benchmarks(names: List[str] | None = None, scales: List[int] | None = None,
+                   repeat: int = 3, seed: int = 42) -> Dict:
+    """Run the selected benchmarks; returns a JSON-serializable result document."""
+    names = names or list(BENCHMARKS)
+    scales = scales or DEFAULT_SCALES
+    results = []
+    for name in names:
+        for scale in scales:
+            runs = [BENCHMARKS[name](scale, seed) for _ in range(repeat)]
+            best = min(runs)
+            results.append({
+                "bench": name,
+                "scale": scale,
+                "best_s": round(best, 6),
+                "median_s": round(statistics.median(runs), 6),
+                "per_record_us": round(best / scale * 1_000_000, 3),
+                "records_per_sec": round(scale / best, 1) if best else None,
+            })
+            print(f"{name:28s} {scale:>8d}  best {best:9.4f}s  ({results[-1]['per_record_us']} us/record)")
+    return {"meta": _meta(seed, repeat), "results": results}
+
+
+def compare_results(baseline: Dict, candidate: Dict, threshold: float = 0.10) -> int:
+    """Print per-benchmark speed ratios; returns the number of regressions."""
+    base = {(r["bench"], r["scale"]): r["best_s"] for r in baseline["results"]}
+    regressions = 0
+    print(f"baseline {baseline['meta'].get('commit')}  vs  candidate {candidate['meta'].get('commit')}")
+    for r in candidate["results"]:
+        key = (r["bench"], r["scale"])
+        if key not in base or not base[key]:
+            continue
+        ratio = r["best_s"] / base[key]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{r['bench']:28s} {r['scale']:>8d}  {base[key]:9.4f}s -> {r['best_s']:9.4f}s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the news feed pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run benchmarks and write JSON results")
+    run.add_argument("--out", default="bench_results.json")
+    run.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)))
+    run.add_argument("--bench", action="append", choices=sorted(BENCHMARKS),
+                     help="benchmark to run (repeatable, default: all)")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--seed", type=int, default=42)
+    imp = sub.add_parser("importtime", help="measure cold-start import time of the front ends")
+    imp.add_argument("--out", default="bench_import.json")
+    imp.add_argument("--module", action="append", help="module to import (repeatable)")
+    imp.add_argument("--repeat", type=int, default=5)
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("candidate")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.command in ("run", "importtime"):
+        if args.command == "run":
+            scales = [int(s) for s in args.scales.split(",") if s]
+            doc = run_benchmarks(args.bench, scales, args.repeat, args.seed)
+        else:
+            doc = run_import_benchmarks(args.module, args.repeat)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"Results written to {args.out}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+    return 1 if compare_results(baseline, candidate, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
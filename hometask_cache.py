@@ -0,0 +1,110 @@
+"""
+Bounded memoization of text normalization.
+
+Partner feeds repeat the same boilerplate texts, cities and locations over
+and over. hometask_core wraps process_text and process_text_summary with
+the shared TEXT_CACHE, so every front end, file reader and interactive menu
+normalizes each distinct string once while it stays in the cache.
+"""
+import functools
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+
+def _chars(value) -> int:
+    """Characters held by a cached value (str, or a dict of str/int values)."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(v) for v in value.values() if isinstance(v, str))
+    return 0
+
+
+class SizedLRUCache:
+    """
+    Least-recently-used cache bounded by entry count and by the total number
+    of characters of its keys and values. Items larger than
+    `max_item_chars` are computed but not stored, so one huge text cannot
+    flush everything else.
+    """
+
+    def __init__(self, max_entries: int = 50_000, max_chars: int = 16 << 20, max_item_chars: int | None = None):
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.max_item_chars = max_item_chars if max_item_chars is not None else max_chars // 64
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key: Hashable, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value, size: int):
+        if size > self.max_item_chars or not self.max_entries:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.chars -= old[1]
+        self._data[key] = (value, size)
+        self.chars += size
+        if len(self._data) > self.max_entries or self.chars > self.max_chars:
+            self._shrink()
+
+    def _shrink(self):
+        data = self._data
+        while data and (len(data) > self.max_entries or self.chars > self.max_chars):
+            _, (_, size) = data.popitem(last=False)
+            self.chars -= size
+            self.evictions += 1
+
+    def resize(self, max_entries: int | None = None, max_chars: int | None = None):
+        """Change the limits, evicting the oldest entries if needed."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_chars is not None:
+            self.max_chars = max_chars
+            self.max_item_chars = max_chars // 64
+        self._shrink()
+
+    def clear(self):
+        self._data.clear()
+        self.chars = 0
+
+    def stats(self) -> Dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {"entries": len(self._data), "chars": self.chars, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0}
+
+    def memoize(self, func: Callable[[str], object]) -> Callable[[str], object]:
+        """Cache a one-string-argument function; dict results are returned as copies."""
+        name = func.__name__
+        data = self._data
+
+        @functools.wraps(func)
+        def wrapper(text):
+            key = (name, text)
+            entry = data.get(key)
+            if entry is not None:
+                data.move_to_end(key)
+                self.hits += 1
+                value = entry[0]
+            else:
+                self.misses += 1
+                value = func(text)
+                self.put(key, value, len(text) + _chars(value))
+            return dict(value) if type(value) is dict else value
+        return wrapper
@@ -0,0 +1,179 @@
+"""
+Character-class statistics counted in bulk.
+
+Every character falls into exactly one class, using the same str
+predicates as the rest of the repo:
+
+    whitespace     c.isspace()                     (count_whitespaces)
+    upper / lower  c.isalpha() and c.isupper() / c.islower()
+    other_letters  c.isalpha() without case (e.g. CJK)
+    digits         c.isdigit()
+    punctuation    Unicode category P* or S*
+    other          everything else (controls, combining marks, ...)
+
+`letters` counts each alphabetic character as written, the input of
+FeedStats and the letter CSVs.
+
+Text is encoded to UTF-8 once. The ASCII bytes are counted with
+bytes.translate() deletes and bytes.count(), or one NumPy bincount for
+large inputs when NumPy is installed. Non-ASCII characters (removed
+from the same buffer with one translate) are counted with Counter and
+classified one distinct character at a time.
+"""
+import unicodedata
+from collections import Counter
+from typing import Dict
+
+CLASSES = ("whitespace", "upper", "lower", "other_letters", "digits", "punctuation", "other")
+
+# NumPy's bincount only pays off on larger buffers.
+NUMPY_MIN_BYTES = 1 << 16
+
+
+def char_class(c: str) -> str:
+    """Class of a single character."""
+    if c.isspace():
+        return "whitespace"
+    if c.isalpha():
+        return "upper" if c.isupper() else "lower" if c.islower() else "other_letters"
+    if c.isdigit():
+        return "digits"
+    if unicodedata.category(c)[0] in "PS":
+        return "punctuation"
+    return "other"
+
+
+_ASCII = [chr(i) for i in range(128)]
+_ASCII_CLASS = [char_class(c) for c in _ASCII]
+_CLASS_BYTES: Dict[str, bytes] = {cls: bytes(i for i, name in enumerate(_ASCII_CLASS) if name == cls)
+                                  for cls in CLASSES}
+_NON_LETTER_BYTES = bytes(i for i, c in enumerate(_ASCII) if not c.isalpha())
+_LETTER_BYTES = [(c, bytes([i])) for i, c in enumerate(_ASCII) if c.isalpha()]
+_ASCII_BYTES = bytes(range(128))
+_HIGH_BYTES = bytes(range(128, 256))
+
+_numpy = None
+
+
+def _load_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+def _split_ascii(text: str):
+    """(ASCII bytes, non-ASCII remainder as str) of `text`."""
+    if text.isascii():
+        return text.encode("ascii"), ""
+    # UTF-8 sequences of non-ASCII characters only use bytes >= 0x80, so
+    # deleting either half of the byte range leaves valid pieces.
+    data = text.encode("utf-8", "surrogatepass")
+    return (data.translate(None, _HIGH_BYTES),
+            data.translate(None, _ASCII_BYTES).decode("utf-8", "surrogatepass"))
+
+
+def _ascii_letter_counts(data: bytes) -> Dict[str, int]:
+    """Per-letter counts of ASCII bytes: one bytes.count() per letter on the letters only."""
+    letters = data.translate(None, _NON_LETTER_BYTES)
+    counts = {}
+    for c, byte in _LETTER_BYTES:
+        n = letters.count(byte)
+        if n:
+            counts[c] = n
+    return counts
+
+
+class CharClassStats:
+    """Mergeable per-class character counts plus per-letter counts."""
+
+    __slots__ = CLASSES + ("letters",)
+
+    def __init__(self):
+        for cls in CLASSES:
+            setattr(self, cls, 0)
+        self.letters = Counter()
+
+    def __repr__(self):
+        counts = ", ".join(f"{cls}={getattr(self, cls)}" for cls in CLASSES)
+        return f"CharClassStats({counts})"
+
+    @property
+    def total(self) -> int:
+        return sum(getattr(self, cls) for cls in CLASSES)
+
+    def add_text(self, text: str) -> "CharClassStats":
+        data, rest = _split_ascii(text)
+        if data:
+            np = _load_numpy() if len(data) >= NUMPY_MIN_BYTES else False
+            if np:
+                self._add_histogram(np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=128).tolist())
+            else:
+                self._add_ascii(data)
+        if rest:
+            for c, n in Counter(rest).items():
+                cls = char_class(c)
+                setattr(self, cls, getattr(self, cls) + n)
+                if c.isalpha():
+                    self.letters[c] += n
+        return self
+
+    def _add_ascii(self, data: bytes):
+        counts = _ascii_letter_counts(data)
+        self.letters.update(counts)
+        counted = 0
+        for c, n in counts.items():
+            if c.isupper():
+                self.upper += n
+            else:
+                self.lower += n
+            counted += n
+        for cls in ("whitespace", "digits", "punctuation"):
+            n = len(data) - len(data.translate(None, _CLASS_BYTES[cls]))
+            setattr(self, cls, getattr(self, cls) + n)
+            counted += n
+        self.other += len(data) - counted
+
+    def _add_histogram(self, histogram):
+        for i, n in enumerate(histogram):
+            if n:
+                c = _ASCII[i]
+                cls = _ASCII_CLASS[i]
+                setattr(self, cls, getattr(self, cls) + n)
+                if c.isalpha():
+                    self.letters[c] += n
+
+    def update(self, other: "CharClassStats") -> "CharClassStats":
+        for cls in CLASSES:
+            setattr(self, cls, getattr(self, cls) + getattr(other, cls))
+        self.letters.update(other.letters)
+        return self
+
+    def as_dict(self) -> Dict[str, int]:
+        return {cls: getattr(self, cls) for cls in CLASSES}
+
+
+def char_class_stats(text: str) -> CharClassStats:
+    return CharClassStats().add_text(text)
+
+
+def count_whitespaces(text: str) -> int:
+    """Same result as sum(1 for c in text if c.isspace())."""
+    data, rest = _split_ascii(text)
+    count = len(data) - len(data.translate(None, _CLASS_BYTES["whitespace"]))
+    if rest:
+        count += sum(n for c, n in Counter(rest).items() if c.isspace())
+    return count
+
+
+def letter_counts(text: str) -> Counter:
+    """Alphabetic characters of `text` as written, e.g. {'T': 1, 'h': 2}."""
+    data, rest = _split_ascii(text)
+    counts = Counter(_ascii_letter_counts(data))
+    if rest:
+        counts.update({c: n for c, n in Counter(rest).items() if c.isalpha()})
+    return counts
@@ -0,0 +1,126 @@
+import itertools
+import os
+from typing import Dict, Iterable, Iterator, Tuple, TypeVar
+
+from hometask_feedlock import feed_lock
+from hometask_profile import profiled
+
+T = TypeVar("T")
+
+
+class CheckpointJournal:
+    """
+    Remembers how many records of each input file were already published,
+    so a crashed run can resume instead of republishing the whole file.
+
+    Journal format (JSON):
+    {
+      "/abs/path/records.txt": {"fingerprint": "1234:1700000000000000000", "committed": 250}
+    }
+
+    The fingerprint (size and mtime) ties a checkpoint to one version of
+    the file: a replaced file with the same name starts from zero again.
+    Commits are kept in memory and written every `batch_size` records,
+    so after a hard crash at most `batch_size - 1` records are repeated.
+
+    Several processes may share one journal while ingesting different
+    files. flush() holds the lock on <journal>.lock, re-reads the journal
+    and writes back only the entries this instance changed, so writers do
+    not overwrite each other's checkpoints.
+    """
+
+    DEFAULT_PATH = "ingest_checkpoints.json"
+
+    def __init__(self, journal_path: str = DEFAULT_PATH, batch_size: int = 100):
+        self.journal_path = journal_path
+        self.batch_size = max(1, batch_size)
+        self._entries: Dict[str, Dict[str, object]] = self._load()
+        # Entries changed since the last flush; None marks a removed entry.
+        self._changed: Dict[str, Dict[str, object] | None] = {}
+        self._pending = 0
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        if not os.path.exists(self.journal_path):
+            return {}
+        import json
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable checkpoint journal {self.journal_path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def _fingerprint(file_path: str) -> str:
+        st = os.stat(file_path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def start(self, file_path: str) -> int:
+        """Return the number of records already committed for this file."""
+        key = self._key(file_path)
+        fingerprint = self._fingerprint(file_path)
+        if key not in self._changed:
+            # Another process may have checkpointed the file since we loaded.
+            self._entries[key] = self._load().get(key)
+        entry = self._entries.get(key)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            entry = self._entries[key] = {"fingerprint": fingerprint, "committed": 0}
+            self._changed[key] = entry
+            return 0
+        committed = int(entry.get("committed", 0))
+        if committed:
+            print(f"Resuming {file_path} after {committed} committed records.")
+        return committed
+
+    def resume(self, file_path: str, records: Iterable[T]) -> Iterator[Tuple[int, T]]:
+        """Enumerate records, skipping the already committed prefix."""
+        start = self.start(file_path)
+        return enumerate(itertools.islice(records, start, None), start)
+
+    def commit(self, file_path: str, committed: int):
+        """Mark the first `committed` records as published; writes in batches."""
+        key = self._key(file_path)
+        entry = self._changed[key] = self._entries[key]
+        entry["committed"] = committed
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def complete(self, file_path: str):
+        """Forget a fully processed file."""
+        key = self._key(file_path)
+        if self._entries.pop(key, None) is not None:
+            self._changed[key] = None
+            self._pending += 1
+        self.flush()
+
+    @profiled("checkpoint.flush")
+    def flush(self):
+        """Atomically merge this instance's changes into the journal, if any."""
+        if not self._pending:
+            return
+        import json
+        # The journal itself is replaced on every flush, so the lock is held
+        # on a sidecar file that stays in place.
+        lock_path = self.journal_path + ".lock"
+        if not os.path.exists(lock_path):
+            open(lock_path, "a").close()
+        with feed_lock(lock_path):
+            entries = self._load()
+            for key, entry in self._changed.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            tmp_path = f"{self.journal_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.journal_path)
+        self._entries = entries
+        self._changed.clear()
+        self._pending = 0
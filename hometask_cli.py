@@ -0,0 +1,270 @@
+"""
+Non-interactive command line for the news feed (hometask_db pipeline).
+
+Examples:
+  python hometask_cli.py publish news --text "Big match today" --city London
+  python hometask_cli.py publish ad --text "Bike for sale" --expires 2030-01-01
+  python hometask_cli.py publish event --name Expo --location Hall --time "2030-01-01 10:00"
+  python hometask_cli.py publish --jsonl records.jsonl      # one JSON record per line, '-' = stdin
+  python hometask_cli.py ingest inputs/a.txt inputs/b.json inputs/c.xml
+  python hometask_cli.py --db-write-behind ingest inputs/big.json   # batched DB commits
+  python hometask_cli.py stats
+  python hometask_cli.py stats --top 1000    # word_top.csv: the 1000 most frequent words
+  python hometask_cli.py --rotate-mb 10 --compress-segments stats   # rotate the feed past 10 MB
+  python hometask_cli.py query events --limit 5
+  python hometask_cli.py query events --from 2030-03-01 --to 2030-04-01 --limit 0   # 0 = all rows
+  python hometask_cli.py query private_ads --expiring-within 7
+  python hometask_cli.py search london match        # ranked full-text search
+  python hometask_cli.py maintain            # daily: archive expired ads, refresh days_left
+
+Batch commands refresh the statistics CSVs once at the end (skip with --no-stats).
+The feed is only rotated into segments when --rotate-mb or --rotate-hours is given.
+"""
+import argparse
+import contextlib
+import os
+import sys
+from typing import Iterable, Iterator, List
+
+from hometask_profile import DEFAULT_REPORT_PATH, PROFILER
+from hometask_records import Event, News, PrivateAd, Record, RecordError, build_record
+
+
+def _iter_jsonl(path: str) -> Iterator[Record | RecordError]:
+    """Records from a JSON Lines file; bad lines are yielded as errors."""
+    import json
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield build_record(json.loads(line))
+            except (ValueError, AttributeError) as e:
+                yield RecordError(f"line {line_no}: {e}")
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _flag_record(args) -> Record | None:
+    if args.kind == "news":
+        return News(args.text, args.city or "Unknown")
+    if args.kind == "ad":
+        return PrivateAd(args.text, args.expires)
+    if args.kind == "event":
+        return Event(args.name, args.location, args.time)
+    return None
+
+
+def publish_records(records: Iterable[Record | RecordError], feed_path: str) -> int:
+    """Publish a batch of records; returns the number of failures."""
+    import hometask_db
+    failures = 0
+    for rec in records:
+        try:
+            if isinstance(rec, RecordError):
+                raise rec
+            hometask_db.publish_record(rec, feed_path)
+        except Exception as e:
+            print(f"Failed to publish record: {e}", file=sys.stderr)
+            failures += 1
+    return failures
+
+
+def ingest_files(paths: List[str], feed_path: str) -> int:
+    """Ingest text/JSON/XML input files by extension; returns the number of failures."""
+    import hometask_db
+    # .txt files hold '---' delimited records, each published on its own.
+    handlers = {".txt": hometask_db.DelimitedTextFileInput, ".json": hometask_db.JSONFileInput,
+                ".xml": hometask_db.XMLFileInput}
+    failures = 0
+    for path in paths:
+        handler = handlers.get(os.path.splitext(path)[1].lower())
+        if handler is None:
+            print(f"Unsupported input file: {path}", file=sys.stderr)
+            failures += 1
+            continue
+        try:
+            handler(os.path.dirname(path) or ".").process_file(path, feed_path)
+        except Exception as e:
+            print(f"Failed to ingest {path}: {e}", file=sys.stderr)
+            failures += 1
+    return failures
+
+
+def refresh_statistics(feed_path: str, top_words: int | None = None):
+    import hometask_db
+    if top_words is None:
+        hometask_db.update_csvs(feed_path)
+    else:
+        hometask_db.update_csvs(feed_path, top_words)
+
+
+def _query_rows(parser: argparse.ArgumentParser, args) -> Iterator[dict]:
+    """Rows for the query command: filtered queries stream, plain ones show the newest rows."""
+    filters = {"news": args.city is not None, "private_ads": args.expiring_within is not None,
+               "events": args.start is not None or args.end is not None}
+    for table, used in filters.items():
+        if used and table != args.table:
+            parser.error(f"that filter does not apply to {args.table}")
+    if not filters[args.table]:
+        import hometask_db
+        yield from hometask_db.get_db_handler().fetch_rows(args.table, args.limit or -1)
+        return
+
+    from hometask_queries import FeedQueries
+    with FeedQueries() as queries:
+        if args.table == "news":
+            yield from queries.iter_recent_news(args.city)
+        elif args.table == "private_ads":
+            yield from queries.iter_ads_expiring_within(args.expiring_within)
+        else:
+            yield from queries.iter_events_between(args.start or "", args.end or "\uffff")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hometask_cli", description="News feed batch commands.")
+    parser.add_argument("--feed", default="news_feed.txt", help="feed file (default: news_feed.txt)")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_REPORT_PATH, metavar="REPORT",
+                        help="write a per-stage latency report (JSON)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="suppress per-record messages")
+    parser.add_argument("--db-write-behind", action="store_true",
+                        help="queue DB inserts and commit them in batches from a writer thread")
+    parser.add_argument("--rotate-mb", type=float, metavar="MB",
+                        help="rotate the feed into a segment once it reaches MB megabytes")
+    parser.add_argument("--rotate-hours", type=float, metavar="HOURS",
+                        help="rotate the feed into a segment once it is HOURS hours old")
+    parser.add_argument("--compress-segments", action="store_true", help="gzip rotated segments")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pub = sub.add_parser("publish", help="publish one record from flags or many from JSON Lines")
+    pub.add_argument("kind", nargs="?", choices=["news", "ad", "event"])
+    pub.add_argument("--text")
+    pub.add_argument("--city")
+    pub.add_argument("--expires", help="YYYY-MM-DD")
+    pub.add_argument("--name")
+    pub.add_argument("--location")
+    pub.add_argument("--time", help="YYYY-MM-DD HH:MM")
+    pub.add_argument("--jsonl", action="append", default=[], metavar="FILE",
+                     help="JSON Lines file of records ('-' for stdin), repeatable")
+    pub.add_argument("--no-stats", action="store_true", help="skip the statistics refresh")
+
+    ing = sub.add_parser("ingest", help="ingest text/JSON/XML input files")
+    ing.add_argument("files", nargs="+")
+    ing.add_argument("--no-stats", action="store_true", help="skip the statistics refresh")
+
+    sts = sub.add_parser("stats", help="refresh word/letter statistics CSVs")
+    sts.add_argument("--top", type=int, metavar="K", help="words in the ranked word_top.csv (default 5000)")
+
+    qry = sub.add_parser("query", help="print newest DB rows as JSON lines")
+    qry.add_argument("table", choices=["news", "private_ads", "events"])
+    qry.add_argument("--limit", type=int, default=20, help="maximum rows, 0 for all")
+    qry.add_argument("--city", help="news of one city, newest first")
+    qry.add_argument("--expiring-within", type=int, metavar="DAYS", help="ads expiring within DAYS days")
+    qry.add_argument("--from", dest="start", metavar="TIME", help="events at or after TIME")
+    qry.add_argument("--to", dest="end", metavar="TIME", help="events before TIME")
+
+    srch = sub.add_parser("search", help="full-text search over published DB records")
+    srch.add_argument("terms", nargs="*", help="words that must all match")
+    srch.add_argument("--limit", type=int, default=20)
+    srch.add_argument("--raw", action="store_true", help="pass the terms as an FTS5 query")
+    srch.add_argument("--rebuild", action="store_true", help="rebuild the search index first")
+
+    mnt = sub.add_parser("maintain", help="archive expired ads and refresh days_left in the DB")
+    mnt.add_argument("--purge", action="store_true", help="delete expired ads instead of archiving them")
+    mnt.add_argument("--batch-size", type=int, default=1000)
+    mnt.add_argument("--every", type=float, metavar="SECONDS", help="keep running at this interval")
+
+    sub.add_parser("interactive", help="run the interactive menu")
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.profile:
+        PROFILER.enable(args.profile)
+
+    if args.db_write_behind:
+        import hometask_db
+        hometask_db.configure_db_handler(write_behind=True)
+
+    if args.rotate_mb is not None or args.rotate_hours is not None:
+        import datetime
+        from hometask_feed import configure_rotation
+        configure_rotation(
+            max_bytes=int(args.rotate_mb * 1024 * 1024) if args.rotate_mb is not None else None,
+            max_age=datetime.timedelta(hours=args.rotate_hours) if args.rotate_hours is not None else None,
+            compress=args.compress_segments)
+
+    quiet = open(os.devnull, "w") if args.quiet else None
+    out = contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext()
+    failures = 0
+    try:
+        if args.command == "publish":
+            if args.kind is None and not args.jsonl:
+                parser.error("publish needs a record kind or --jsonl")
+            batches = []
+            if args.kind:
+                batches.append([_flag_record(args)])
+            batches.extend(_iter_jsonl(path) for path in args.jsonl)
+            with out:
+                for batch in batches:
+                    failures += publish_records(batch, args.feed)
+                if not args.no_stats:
+                    refresh_statistics(args.feed)
+
+        elif args.command == "ingest":
+            with out:
+                failures = ingest_files(args.files, args.feed)
+                if not args.no_stats:
+                    refresh_statistics(args.feed)
+
+        elif args.command == "stats":
+            with out:
+                refresh_statistics(args.feed, args.top)
+
+        elif args.command == "query":
+            import itertools
+            import json
+            # closing() ends the generator, and its FeedQueries, when --limit stops early.
+            with contextlib.closing(_query_rows(parser, args)) as rows:
+                for row in itertools.islice(rows, args.limit or None):
+                    print(json.dumps(row, ensure_ascii=False))
+
+        elif args.command == "search":
+            import json
+            from hometask_queries import FeedQueries
+            with FeedQueries() as queries:
+                if args.rebuild:
+                    queries.rebuild_search_index()
+                for row in queries.search(" ".join(args.terms), args.limit, args.raw):
+                    print(json.dumps(row, ensure_ascii=False))
+
+        elif args.command == "maintain":
+            import json
+            import time
+            from hometask_maintenance import AdMaintenance
+            maintenance = AdMaintenance(batch_size=args.batch_size)
+            while True:
+                print(json.dumps(maintenance.run(purge=args.purge)), flush=True)
+                if not args.every:
+                    break
+                time.sleep(args.every)
+
+        elif args.command == "interactive":
+            import hometask_db
+            hometask_db.main()
+    finally:
+        if args.db_write_behind:
+            with out:
+                hometask_db.close_db_handler()
+        if quiet:
+            quiet.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
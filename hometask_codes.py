@@ -0,0 +1,54 @@
+import base64
+import os
+from typing import Callable, List, Set
+
+# Every 5 random bytes base32-encode to exactly 8 characters (40 bits),
+# the same length as the old uuid4()[:8] codes, which carried 32 bits.
+CODE_LENGTH = 8
+_BYTES_PER_CODE = 5
+
+
+class EventCodeGenerator:
+    """
+    Short unique event codes drawn from one buffered randomness source.
+
+    Candidates are made `batch_size` at a time from a single os.urandom()
+    call and one base32 encode. Each batch is filtered against the codes
+    issued by this process and, if `taken` is set, against codes stored
+    elsewhere (hometask_db checks the indexed events.event_code column with
+    one query per batch), so next_code() is usually just a list pop.
+    """
+
+    def __init__(self, batch_size: int = 1024, taken: Callable[[List[str]], Set[str]] | None = None):
+        self.batch_size = max(1, batch_size)
+        self.taken = taken
+        self._issued: Set[str] = set()
+        self._ready: List[str] = []
+
+    def set_taken(self, taken: Callable[[List[str]], Set[str]] | None):
+        """Change the external uniqueness check; buffered codes are re-checked."""
+        self.taken = taken
+        self._ready.clear()
+
+    def _refill(self):
+        encoded = base64.b32encode(os.urandom(_BYTES_PER_CODE * self.batch_size)).decode("ascii").lower()
+        candidates = [encoded[i:i + CODE_LENGTH] for i in range(0, len(encoded), CODE_LENGTH)]
+        fresh = set(candidates) - self._issued
+        if self.taken is not None and fresh:
+            fresh -= self.taken(list(fresh))
+        self._ready = list(fresh)
+
+    def next_code(self) -> str:
+        while not self._ready:
+            self._refill()
+        code = self._ready.pop()
+        self._issued.add(code)
+        return code
+
+
+EVENT_CODES = EventCodeGenerator()
+
+
+def next_event_code() -> str:
+    """A new event code from the shared generator."""
+    return EVENT_CODES.next_code()
@@ -0,0 +1,525 @@
+"""
+Shared engine of the news feed front ends.
+
+hometask_modulesfiles, hometask_csvparsing, hometask_json, hometask_xml and
+hometask_db used to carry their own copies of the text normalization,
+publishing, input parsing and statistics code. They now import it from here
+and only keep their interactive menus and small per-module differences.
+"""
+import abc
+import os
+import datetime
+import re
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from hometask_cache import SizedLRUCache
+from hometask_charstats import count_whitespaces
+from hometask_checkpoint import CheckpointJournal
+from hometask_codes import next_event_code
+from hometask_dedup import get_dedup_index
+from hometask_feedlock import append_record, locked_append
+from hometask_profile import PROFILER, profiled, stage
+from hometask_records import Event, News, PrivateAd, Record, RecordError, build_record, iter_text_fields
+
+
+# =========================
+# TEXT NORMALIZATION
+# =========================
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+MISSPELLED_IZ = re.compile(r'\biz\b', re.IGNORECASE)
+
+# Normalized results of every front end, bounded by entries and characters.
+# TEXT_CACHE.stats() has the hit/miss counters (also in --profile reports).
+TEXT_CACHE = SizedLRUCache()
+PROFILER.add_gauge("text_cache", TEXT_CACHE.stats)
+
+
+def normalize_case(text: str) -> List[str]:
+    """Normalize text to sentence case."""
+    sentences = SENTENCE_END.split(text.strip())
+    return [s.capitalize() for s in sentences if s]
+
+
+def fix_misspelling(sentences: List[str]) -> List[str]:
+    """Replace 'iz' with 'is' when used incorrectly."""
+    return [MISSPELLED_IZ.sub('is', s) for s in sentences]
+
+
+def extract_last_words(sentences: List[str]) -> str:
+    """One extra sentence built from the last word of every sentence."""
+    last_words = [s.rstrip('.!?').split()[-1] for s in sentences if s]
+    return " ".join(last_words).capitalize() + "."
+
+
+@profiled("text.process_text")
+@TEXT_CACHE.memoize
+def process_text(text: str) -> str:
+    """Full normalization pipeline returning final text."""
+    return " ".join(fix_misspelling(normalize_case(text)))
+
+
+@profiled("text.process_text_summary")
+@TEXT_CACHE.memoize
+def process_text_summary(text: str) -> Dict[str, str | int]:
+    """Normalized text plus the last-words sentence, and the whitespace count of the input."""
+    fixed = fix_misspelling(normalize_case(text))
+    final_text = " ".join(fixed) + " " + extract_last_words(fixed)
+    return {"final_text": final_text, "whitespace_count": count_whitespaces(text)}
+
+
+# =========================
+# PUBLISHING
+# =========================
+# Publishers take already normalized text. With strict=False (the text
+# front ends) an invalid date is reported and skipped; with strict=True
+# (the XML/DB front ends) the ValueError propagates to the caller.
+
+def days_until(exp_date: datetime.datetime, now: datetime.datetime | None = None) -> int:
+    """Whole days left before an ad expires, as printed in the feed."""
+    return (exp_date - (now or datetime.datetime.now())).days
+
+
+@profiled("feed.append")
+def write_record(file_path: str, content: str):
+    """Append one record; safe with other processes appending to the same feed."""
+    append_record(file_path, content + "\n\n")
+
+
+def _append_unique(file_path: str, record: Record, render: Callable[[], str]) -> bool:
+    """Append render() unless `record` is already in the feed; False for a duplicate.
+
+    The dedup check, the append and the index update hold the feed lock
+    together, so concurrent publishers cannot both add the same record.
+    """
+    index = get_dedup_index(file_path)
+    digest = index.digest(record)
+    with stage("feed.append"), locked_append(file_path) as write:
+        index.refresh()
+        if digest in index:
+            PROFILER.count("records.duplicate")
+            return False
+        write((render() + "\n\n").encode("utf-8"))
+        index.add(digest)
+    PROFILER.count("records.published")
+    return True
+
+
+@profiled("publish.news")
+def publish_news(file_path: str, text: str, city: str) -> str | None:
+    """Append a news record; returns its date, or None for a duplicate."""
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    if not _append_unique(file_path, News(text, city),
+                          lambda: f"News -------------------------\n{text}\n{city}, {date}"):
+        print("Duplicate news detected — not published.")
+        return None
+    return date
+
+
+@profiled("publish.ad")
+def publish_private_ad(file_path: str, text: str, exp_date_str: str, strict: bool = False) -> int | None:
+    """Append a private ad; returns its days left, or None if skipped."""
+    try:
+        with stage("date.strptime"):
+            exp_date = datetime.datetime.strptime(exp_date_str, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        if strict:
+            raise
+        print(f"Invalid date format for ad: {exp_date_str}")
+        PROFILER.count("records.invalid")
+        return None
+    days_left = days_until(exp_date)
+    if not _append_unique(file_path, PrivateAd(text, exp_date_str),
+                          lambda: f"Private Ad -------------------\n{text}\nExpires: {exp_date_str}, {days_left} days left"):
+        print("Duplicate ad detected — not published.")
+        return None
+    return days_left
+
+
+@profiled("publish.event")
+def publish_event(file_path: str, name: str, location: str, time_str: str, strict: bool = False) -> str | None:
+    """Append an event; returns its event code, or None if skipped."""
+    try:
+        with stage("date.strptime"):
+            event_time = datetime.datetime.strptime(time_str, "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        if strict:
+            raise
+        print(f"Invalid date/time format for event: {time_str}")
+        PROFILER.count("records.invalid")
+        return None
+    time_text = event_time.strftime('%Y-%m-%d %H:%M')
+    event_code = None
+
+    def render() -> str:
+        nonlocal event_code
+        event_code = next_event_code()  # only drawn for records that get published
+        return (f"Event ------------------------\n"
+                f"Event: {name}\n"
+                f"Location: {location}\n"
+                f"Time: {time_text}\n"
+                f"Event Code: {event_code}")
+
+    if not _append_unique(file_path, Event(name, location, time_text), render):
+        print("Duplicate event detected — not published.")
+        return None
+    return event_code
+
+
+def publish_record(file_path: str, record: Record, strict: bool = False):
+    """Validate a typed record and hand it to the matching publisher."""
+    record.validate()
+    if isinstance(record, News):
+        return publish_news(file_path, record.text, record.city)
+    if isinstance(record, PrivateAd):
+        return publish_private_ad(file_path, record.text, record.expires, strict)
+    return publish_event(file_path, record.name, record.location, record.time, strict)
+
+
+# =========================
+# SUMMARY PUBLISHING (XML/DB FRONT ENDS)
+# =========================
+
+class SummaryPublisher:
+    """
+    Publishing as the XML and DB front ends do it: news and ad texts get
+    the last-words sentence of process_text_summary, dates are strict and
+    every published record is announced. Subclasses keep published
+    records elsewhere too by overriding the store_* hooks (hometask_db).
+    """
+
+    def before_publish(self):
+        """Called before each record is published."""
+
+    def store_news(self, text: str, city: str, date: str):
+        pass
+
+    def store_ad(self, text: str, exp_date_str: str, days_left: int):
+        pass
+
+    def store_event(self, name: str, location: str, time_str: str, event_code: str):
+        pass
+
+    def publish_news(self, text: str, city: str, file_path: str):
+        self.before_publish()
+        text = process_text_summary(text)["final_text"]
+        date = publish_news(file_path, text, city)
+        if date is not None:
+            self.store_news(text, city, date)
+            print("News published!\n")
+
+    def publish_private_ad(self, text: str, exp_date_str: str, file_path: str):
+        self.before_publish()
+        text = process_text_summary(text)["final_text"]
+        days_left = publish_private_ad(file_path, text, exp_date_str, strict=True)
+        if days_left is not None:
+            self.store_ad(text, exp_date_str, days_left)
+            print("Private Ad published!\n")
+
+    def publish_event(self, name: str, location: str, time_str: str, file_path: str):
+        self.before_publish()
+        event_code = publish_event(file_path, name, location, time_str, strict=True)
+        if event_code is not None:
+            self.store_event(name, location, time_str, event_code)
+            print("Event published!\n")
+
+    def publish_record(self, record: Record, file_path: str):
+        """Validate a typed record and hand it to the matching publisher."""
+        record.validate()
+        if isinstance(record, News):
+            self.publish_news(record.text, record.city, file_path)
+        elif isinstance(record, PrivateAd):
+            self.publish_private_ad(record.text, record.expires, file_path)
+        else:
+            self.publish_event(record.name, record.location, record.time, file_path)
+
+
+SUMMARY_PUBLISHER = SummaryPublisher()
+
+
+# =========================
+# INPUT FILES (NORMALIZED, RESUMABLE)
+# =========================
+
+class FileRecordProcessor:
+    """
+    Publishes a '---' delimited text file of records into news_feed.txt.
+    Text fields are normalized with process_text; the input file is removed
+    once every record is published. Subclasses may read other formats
+    (see JsonRecordProcessor) or refresh the statistics afterwards.
+    """
+
+    DEFAULT_INPUT_FOLDER = "./input_files"
+    DEFAULT_FILE_NAME = "records.txt"
+    FORMAT = "Input"
+    STAGE = "ingest.text_file"
+    GENERATE_STATISTICS = False
+
+    def __init__(self, file_path: str | None = None):
+        if not os.path.exists(self.DEFAULT_INPUT_FOLDER):
+            os.makedirs(self.DEFAULT_INPUT_FOLDER)
+
+        self.file_path = file_path or os.path.join(self.DEFAULT_INPUT_FOLDER, self.DEFAULT_FILE_NAME)
+        self.output_path = "news_feed.txt"
+        self.journal = CheckpointJournal()
+
+    def _iter_records(self, lines: Iterable[str]) -> Iterator[Record]:
+        """Lazily parse text lines into typed records, one block at a time."""
+        for fields in iter_text_fields(lines):
+            try:
+                yield build_record(fields)
+            except RecordError as e:
+                print(e)
+
+    def _read_records(self, f) -> Iterable[Record]:
+        return self._iter_records(f)
+
+    def _normalize_text_fields(self, rec: Record) -> Record:
+        """Apply text normalization to all text-like fields."""
+        return rec.normalize_text(process_text)
+
+    def process_file(self):
+        """Process all records and remove the input file if successful."""
+        if not os.path.exists(self.file_path):
+            print(f"{self.FORMAT} file not found: {self.file_path}")
+            return
+
+        success = True
+        # Records are published while the file is still being read.
+        # Invalid records are reported and skipped like unparsable ones.
+        # The journal only checkpoints a prefix of handled records, so any
+        # other failure (e.g. I/O) stops processing: records published after
+        # it would be published again by every retry.
+        with stage(self.STAGE), open(self.file_path, "r", encoding="utf-8") as f:
+            try:
+                for index, rec in self.journal.resume(self.file_path, self._read_records(f)):
+                    rec = self._normalize_text_fields(rec)
+                    try:
+                        publish_record(self.output_path, rec)
+                    except RecordError as e:
+                        print(e)
+                    except Exception as e:
+                        print(f"Failed to process record: {e}")
+                        success = False
+                        break
+                    self.journal.commit(self.file_path, index + 1)
+            finally:
+                self.journal.flush()
+
+        if success:
+            os.remove(self.file_path)
+            self.journal.complete(self.file_path)
+            label = "" if self.FORMAT == "Input" else f" {self.FORMAT}"
+            print(f"Processed and removed{label}: {self.file_path}")
+        else:
+            print("Stopped at a failed record. File not removed.")
+
+        if self.GENERATE_STATISTICS:
+            generate_statistics(self.output_path)
+
+
+class JsonRecordProcessor(FileRecordProcessor):
+    """
+    Handles input from JSON files.
+    Expected format examples:
+
+    Single record:
+    {
+      "type": "news",
+      "text": "Some headline text",
+      "city": "Paris"
+    }
+
+    Multiple records:
+    [
+      {"type": "news", "text": "Text1", "city": "Berlin"},
+      {"type": "ad", "text": "Buy now!", "expires": "2025-12-01"},
+      {"type": "event", "name": "Conference", "location": "London", "time": "2025-11-12 09:30"}
+    ]
+    """
+
+    DEFAULT_INPUT_FOLDER = "./input_json"
+    DEFAULT_FILE_NAME = "records.json"
+    FORMAT = "JSON"
+    STAGE = "ingest.json_file"
+
+    def _parse_records(self, data) -> List[Record]:
+        """Turn decoded JSON (object or list of objects) into typed records."""
+        records = []
+        for raw in data if isinstance(data, list) else [data]:
+            try:
+                records.append(build_record(raw))
+            except RecordError as e:
+                print(e)
+        return records
+
+    def _read_records(self, f) -> Iterable[Record]:
+        import json
+        return self._parse_records(json.load(f))
+
+
+# =========================
+# INPUT FILES (RAW, XML/DB FRONT ENDS)
+# =========================
+# These hand records to PUBLISHER; hometask_db swaps in one that also
+# inserts them into its database.
+
+class TextFileInput:
+    PUBLISHER: SummaryPublisher = SUMMARY_PUBLISHER
+
+    def __init__(self, default_folder="inputs"):
+        self.default_folder = default_folder
+        os.makedirs(default_folder, exist_ok=True)
+
+    def publish(self, record: Record, output_file: str):
+        self.PUBLISHER.publish_record(record, output_file)
+
+    @profiled("ingest.text_file")
+    def process_file(self, file_path=None, output_file="news_feed.txt"):
+        file_path = file_path or os.path.join(self.default_folder, "records.txt")
+        if not os.path.exists(file_path):
+            print(f"File {file_path} not found.")
+            return
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = f.read().strip()
+        self.publish(News(data, "Unknown City"), output_file)
+        print("Text file processed successfully.")
+        os.remove(file_path)
+
+
+class _StructuredFileInput(TextFileInput, abc.ABC):
+    """Resumable ingestion of JSON/XML files; bad records are reported and skipped."""
+
+    FORMAT = ""
+    DEFAULT_FILE_NAME = ""
+
+    def __init__(self, default_folder="inputs"):
+        super().__init__(default_folder)
+        self.journal = CheckpointJournal()
+
+    @abc.abstractmethod
+    def _iter_fields(self, file_path: str) -> Iterable[Dict[str, object]]:
+        """Field dicts of the records in `file_path`, in file order."""
+
+    def _ingest(self, file_path=None, output_file="news_feed.txt"):
+        file_path = file_path or os.path.join(self.default_folder, self.DEFAULT_FILE_NAME)
+        if not os.path.exists(file_path):
+            print(f"File {file_path} not found.")
+            return
+        try:
+            for index, fields in self.journal.resume(file_path, self._iter_fields(file_path)):
+                try:
+                    self.publish(build_record(fields), output_file)
+                except ValueError as e:
+                    # A RecordError (unknown type, missing field) or, with
+                    # strict publishing, an unparsable date: skip the record.
+                    print(e)
+                self.journal.commit(file_path, index + 1)
+        finally:
+            self.journal.flush()
+        os.remove(file_path)
+        self.journal.complete(file_path)
+        print(f"{self.FORMAT} file {file_path} processed successfully.")
+
+
+class JSONFileInput(_StructuredFileInput):
+    FORMAT = "JSON"
+    DEFAULT_FILE_NAME = "records.json"
+
+    def _iter_fields(self, file_path: str) -> Iterable[Dict[str, object]]:
+        import json
+        with open(file_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        return records if isinstance(records, list) else [records]
+
+    @profiled("ingest.json_file")
+    def process_file(self, file_path=None, output_file="news_feed.txt"):
+        self._ingest(file_path, output_file)
+
+
+class DelimitedTextFileInput(_StructuredFileInput):
+    """'---' delimited text records ("type: news", "text: ...", ...), one typed record per block."""
+
+    FORMAT = "Text"
+    DEFAULT_FILE_NAME = "records.txt"
+
+    def _iter_fields(self, file_path: str) -> Iterator[Dict[str, object]]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield from iter_text_fields(f)
+
+    @profiled("ingest.delimited_text_file")
+    def process_file(self, file_path=None, output_file="news_feed.txt"):
+        self._ingest(file_path, output_file)
+
+
+class XMLFileInput(_StructuredFileInput):
+    FORMAT = "XML"
+    DEFAULT_FILE_NAME = "records.xml"
+
+    def _iter_fields(self, file_path: str) -> Iterator[Dict[str, object]]:
+        import xml.etree.ElementTree as ET
+        for rec in ET.parse(file_path).getroot().findall("record"):
+            fields = {child.tag: child.text or "" for child in rec}
+            fields["type"] = rec.attrib.get("type", "")
+            yield fields
+
+    @profiled("ingest.xml_file")
+    def process_file(self, file_path=None, output_file="news_feed.txt"):
+        self._ingest(file_path, output_file)
+
+
+# =========================
+# STATISTICS
+# =========================
+# Finished feed segments are not re-read, only the active file is counted.
+# CSVs are published atomically and left untouched when unchanged (hometask_publish).
+# word_top.csv is the compact ranked view: the TOP_WORDS most frequent words.
+# Hourly buckets for time-range queries are brought up to date too (hometask_windows).
+
+TOP_WORDS = 5000
+TOP_WORDS_CSV = "word_top.csv"
+TOP_WORDS_HEADER = ["rank", "word", "count", "percentage"]
+
+@profiled("stats.generate_statistics")
+def generate_statistics(file_path: str, top_words: int = TOP_WORDS):
+    """Create three CSVs:
+    1. word_count.csv — word, count
+    2. letter_stat.csv — letter, count_all, count_uppercase, percentage
+    3. word_top.csv — rank, word, count, percentage of the `top_words` most frequent words
+    """
+    if not os.path.exists(file_path):
+        print(f"No file found: {file_path}")
+        return
+
+    from hometask_feed import feed_statistics
+    from hometask_publish import publish_csv
+    from hometask_windows import update_windows
+    feed_stats = feed_statistics(file_path)
+    update_windows(file_path)
+
+    changed = publish_csv("word_count.csv", ["word", "count"], feed_stats.alpha_word_counts())
+    changed |= publish_csv("letter_stat.csv", ["letter", "count_all", "count_uppercase", "percentage"],
+                           feed_stats.letter_stat_rows())
+    changed |= publish_csv(TOP_WORDS_CSV, TOP_WORDS_HEADER, feed_stats.top_word_rows(top_words, alpha_only=True))
+
+    if changed:
+        print("CSV files recreated: word_count.csv, letter_stat.csv and word_top.csv")
+    else:
+        print("CSV files unchanged: word_count.csv, letter_stat.csv and word_top.csv")
+
+
+@profiled("stats.update_csvs")
+def update_csvs(feed_path="news_feed.txt", top_words: int = TOP_WORDS):
+    """Create word_count.csv (all words), letter_count.csv and the ranked word_top.csv."""
+    if not os.path.exists(feed_path):
+        return
+    from hometask_feed import feed_statistics
+    from hometask_publish import publish_csv
+    from hometask_windows import update_windows
+    feed_stats = feed_statistics(feed_path)
+    update_windows(feed_path)
+    changed = publish_csv("word_count.csv", ["word", "count"], feed_stats.words.items())
+    changed |= publish_csv("letter_count.csv", ["letter", "count_all", "count_uppercase", "percentage"],
+                           feed_stats.letter_count_rows())
+    changed |= publish_csv(TOP_WORDS_CSV, TOP_WORDS_HEADER, feed_stats.top_word_rows(top_words))
+    print("CSV files updated.\n" if changed else "CSV files unchanged.\n")
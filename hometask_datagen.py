@@ -0,0 +1,375 @@
+"""
+Bulk, reproducible test-data generation.
+
+Random dicts
+------------
+
+DictGenerator produces the same shape of data as generate_random_dict /
+generate_list_of_dicts in hometask_functions.py (1-5 distinct lower-case
+letter keys with values 0-100) a whole batch at a time:
+
+    gen = DictGenerator(seed=42)
+    gen.batch(10_000)                        # list of dicts
+    for d in gen.stream(5_000_000): ...      # constant memory
+    write_jsonl("dicts.jsonl", gen.stream(1_000_000))
+
+    python hometask_datagen.py dicts 1000000 --seed 42 -o dicts.jsonl
+
+The same seed and settings always give the same data. Instead of calling
+random.sample()/randint() per key, a batch draws all dict sizes and values
+from seeded random bytes (uniform_ints) and picks each key set from a
+precomputed table of key subsets. use_numpy=True draws from a NumPy
+Generator instead.
+
+Load-test input files
+---------------------
+InputRecordGenerator streams News, Ad and Event records for the '---' text,
+JSON and XML readers; write_input_file() writes them batch by batch, so any
+number of records (or bytes) needs constant memory. hometask_benchmark and
+the tests build their input files with these too:
+
+    python hometask_datagen.py inputs --format xml --size 1G --error-rate 0.01 -o big.xml
+
+Texts mix casing styles and contain stray "iz" words next to words like
+"prize" or "size" that must stay as they are.
+"""
+import datetime
+import random
+import string
+from math import comb
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+LETTERS = string.ascii_lowercase
+BATCH_SIZE = 10_000
+
+# Vocabulary of the synthetic news/ad/event texts.
+WORDS = ["news", "city", "market", "today", "iz", "weather", "traffic", "concert", "sale",
+         "school", "river", "bridge", "price", "people", "festival", "road", "team", "match",
+         "council", "library", "museum", "park", "train", "station", "report", "update"]
+CITIES = ["London", "Paris", "Berlin", "Kyiv", "Warsaw", "Madrid", "Rome", "Vienna"]
+BASE_DATE = datetime.datetime(2030, 1, 1, 9, 0)
+
+# Key sets of size k are looked up in a table of all k-subsets while there
+# are at most this many of them (all sizes up to 5 of 26 letters qualify);
+# larger sizes fall back to random.sample().
+SUBSET_TABLE_LIMIT = 100_000
+
+
+def uniform_ints(rng: random.Random, low: int, high: int, count: int) -> List[int]:
+    """`count` uniform ints in [low, high]; ranges of up to 256 values come from random bytes."""
+    span = high - low + 1
+    if span > 256:
+        return rng.choices(range(low, high + 1), k=count)
+    # Map bytes to 0..span-1, dropping the few above the last full multiple
+    # of span so every value stays equally likely; all of it runs in C.
+    keep = 256 - 256 % span
+    table = bytes(b % span for b in range(256))
+    rejected = bytes(range(keep, 256))
+    data = b""
+    while len(data) < count:
+        needed = count - len(data)
+        data += rng.randbytes(needed * 256 // keep + 16).translate(table, rejected)
+    values = list(data[:count])
+    return values if not low else list(map(low.__add__, values))
+
+
+class DictGenerator:
+    def __init__(self, seed: int | None = None, min_keys: int = 1, max_keys: int = 5,
+                 min_value: int = 0, max_value: int = 100, keys: str = LETTERS,
+                 use_numpy: bool = False):
+        if not 1 <= min_keys <= max_keys <= len(keys):
+            raise ValueError(f"Key counts must satisfy 1 <= {min_keys} <= {max_keys} <= {len(keys)}")
+        self.seed = seed
+        self.min_keys = min_keys
+        self.max_keys = max_keys
+        self.min_value = min_value
+        self.max_value = max_value
+        self.rng = random.Random(seed)
+        # A seeded alphabet order, so table lookups give keys in random order too.
+        self.keys = self.rng.sample(keys, len(keys))
+        self._tables: Dict[int, List[tuple] | None] = {}
+        self._np_rng = None
+        if use_numpy:
+            import numpy as np
+            self._np_rng = np.random.default_rng(seed)
+
+    def _subsets(self, k: int) -> List[tuple] | None:
+        if k not in self._tables:
+            from itertools import combinations
+            small = comb(len(self.keys), k) <= SUBSET_TABLE_LIMIT
+            self._tables[k] = list(combinations(self.keys, k)) if small else None
+        return self._tables[k]
+
+    def _key_sets(self, sizes: List[int]) -> List[tuple]:
+        rng = self.rng
+        by_size: Dict[int, Iterator[tuple]] = {}
+        for k in set(sizes):
+            table = self._subsets(k)
+            wanted = sizes.count(k)
+            if table is not None:
+                by_size[k] = iter(rng.choices(table, k=wanted))
+            else:
+                by_size[k] = iter([tuple(rng.sample(self.keys, k)) for _ in range(wanted)])
+        return [next(by_size[k]) for k in sizes]
+
+    def _numpy_batch(self, count: int) -> List[Dict[str, int]]:
+        import numpy as np
+        rng = self._np_rng
+        letters = np.array(self.keys)
+        sizes = rng.integers(self.min_keys, self.max_keys + 1, count).tolist()
+        # The first k columns of a row-wise argsort are k distinct random keys.
+        order = rng.random((count, len(self.keys))).argsort(axis=1)[:, :self.max_keys]
+        keys = letters[order].tolist()
+        values = rng.integers(self.min_value, self.max_value + 1, (count, self.max_keys)).tolist()
+        return [dict(zip(row_keys[:k], row_values)) for row_keys, row_values, k in zip(keys, values, sizes)]
+
+    def batch(self, count: int) -> List[Dict[str, int]]:
+        """`count` random dicts generated together."""
+        if self._np_rng is not None:
+            return self._numpy_batch(count)
+        rng = self.rng
+        sizes = uniform_ints(rng, self.min_keys, self.max_keys, count)
+        values = iter(uniform_ints(rng, self.min_value, self.max_value, sum(sizes)))
+        return [dict(zip(key_set, values)) for key_set in self._key_sets(sizes)]
+
+    def stream(self, count: int, batch_size: int = BATCH_SIZE) -> Iterator[Dict[str, int]]:
+        """`count` dicts, generated `batch_size` at a time."""
+        while count > 0:
+            size = min(count, batch_size)
+            yield from self.batch(size)
+            count -= size
+
+    def list_of_dicts(self, min_dicts: int = 2, max_dicts: int = 10) -> List[Dict[str, int]]:
+        """Bulk counterpart of generate_list_of_dicts()."""
+        return self.batch(self.rng.randint(min_dicts, max_dicts))
+
+
+# =========================
+# LOAD-TEST INPUT FILES
+# =========================
+
+# Words with "iz" inside that fix_misspelling() must leave alone.
+IZ_WORDS = ["prize", "size", "citizen", "wizard", "horizon"]
+
+ERROR_KINDS = ("unknown_type", "missing_field", "bad_date")
+REQUIRED_FIELDS = {"news": "text", "ad": "expires", "event": "time"}
+
+
+def _casings(rng: random.Random, word: str) -> List[str]:
+    """Casing styles of a word (as is, upper, capitalized, mixed), prepared once per word."""
+    mixed = ["".join(c.upper() if rng.randint(0, 1) else c for c in word) for _ in range(4)]
+    return [word, word, word.upper(), word.capitalize()] + mixed
+
+
+class InputRecordGenerator:
+    """
+    Reproducible stream of input records (lower-case keys, as in the JSON
+    format). Roughly `error_rate` of them are broken in one of `errors`:
+    an unknown type, a missing required field or an unparsable date.
+
+    The '---' text and JSON processors report and skip all three. The XML/DB
+    front ends publish with strict=True, so missing fields and bad dates
+    abort their run; generate only "unknown_type" errors for those.
+    """
+
+    def __init__(self, seed: int = 0, error_rate: float = 0.0, errors: Tuple[str, ...] = ERROR_KINDS,
+                 sentences: Tuple[int, int] = (1, 3), words: Tuple[int, int] = (4, 12)):
+        unknown = set(errors) - set(ERROR_KINDS)
+        if unknown or not errors:
+            raise ValueError(f"Error kinds must be some of {', '.join(ERROR_KINDS)}")
+        self.rng = random.Random(seed)
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        self.sentences = sentences
+        self.words = words
+        self.produced = 0
+        self._variants = [variant for word in WORDS + IZ_WORDS for variant in _casings(self.rng, word)]
+
+    def _sentence(self, min_words: int, max_words: int) -> str:
+        rng = self.rng
+        words = rng.choices(self._variants, k=rng.randint(min_words, max_words))
+        return " ".join(words) + rng.choice(".!?")
+
+    def _text(self) -> str:
+        return " ".join(self._sentence(*self.words) for _ in range(self.rng.randint(*self.sentences)))
+
+    def _break(self, record: Dict[str, str]):
+        rng = self.rng
+        kind = rng.choice(self.errors)
+        if kind == "unknown_type":
+            record["type"] = "memo"
+        elif kind == "missing_field":
+            del record[REQUIRED_FIELDS[record["type"].lower()]]
+        elif "expires" in record:
+            record["expires"] = f"2030-02-{rng.randint(30, 31)}"
+        elif "time" in record:
+            record["time"] = record["time"].replace(" ", "T")
+        else:
+            record["type"] = "memo"  # news has no date to break
+
+    def batch(self, count: int) -> List[Dict[str, str]]:
+        rng = self.rng
+        kinds = rng.choices(("news", "ad", "event"), k=count)
+        days = rng.choices(range(366), k=count)
+        minutes = rng.choices(range(24 * 60), k=count)
+        broken = [rng.random() < self.error_rate for _ in range(count)] if self.error_rate else None
+        records = []
+        for i, kind in enumerate(kinds):
+            number = self.produced + i
+            day = BASE_DATE + datetime.timedelta(days=days[i], minutes=minutes[i])
+            type_name = rng.choice((kind, kind.upper(), kind.capitalize()))
+            if kind == "news":
+                record = {"type": type_name, "text": f"{self._text()} #{number}", "city": rng.choice(CITIES)}
+            elif kind == "ad":
+                record = {"type": type_name, "text": f"{self._text()} #{number}",
+                          "expires": day.strftime("%Y-%m-%d")}
+            else:
+                record = {"type": type_name, "name": f"{self._sentence(1, 3)} #{number}",
+                          "location": rng.choice(CITIES), "time": day.strftime("%Y-%m-%d %H:%M")}
+            if broken and broken[i]:
+                self._break(record)
+            records.append(record)
+        self.produced += count
+        return records
+
+    def stream(self, count: int | None = None, batch_size: int = 1000) -> Iterator[Dict[str, str]]:
+        """`count` records, or an endless stream when count is None."""
+        while count is None or count > 0:
+            size = batch_size if count is None else min(count, batch_size)
+            yield from self.batch(size)
+            if count is not None:
+                count -= size
+
+
+def _text_block(record: Dict[str, str]) -> str:
+    return "".join(f"{key}: {value}\n" for key, value in record.items()) + "---\n"
+
+
+def _xml_element(record: Dict[str, str]) -> str:
+    from xml.sax.saxutils import escape, quoteattr
+    rtype = "private_ad" if record["type"].lower() == "ad" else record["type"]
+    fields = "".join(f"<{k}>{escape(v)}</{k}>" for k, v in record.items() if k != "type")
+    return f"  <record type={quoteattr(rtype)}>{fields}</record>\n"
+
+
+# format -> (header, record encoder, separator, footer)
+INPUT_FORMATS = {
+    "text": ("", _text_block, "", ""),
+    "json": ("[\n", None, ",\n", "\n]\n"),
+    "xml": ("<records>\n", _xml_element, "", "</records>\n"),
+}
+
+
+def write_input_file(file_path: str, records: Iterable[Dict[str, str]], fmt: str = "text",
+                     max_bytes: int | None = None, batch_size: int = 1000) -> Tuple[int, int]:
+    """Stream records into an input file for the given reader format.
+
+    Stops when `records` runs out or the file reaches `max_bytes`; returns
+    (records written, bytes written).
+    """
+    from itertools import islice
+    try:
+        header, encode, separator, footer = INPUT_FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown input format: {fmt} (choose from {', '.join(INPUT_FORMATS)})")
+    if encode is None:
+        import json
+        encode = json.JSONEncoder(ensure_ascii=False, check_circular=False).encode
+    iterator = iter(records)
+    written = 0
+    with open(file_path, "wb") as f:
+        size = f.write(header.encode("utf-8"))
+        while max_bytes is None or size < max_bytes:
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+            if max_bytes is not None:
+                # Keep only as many records as fit into the remaining budget.
+                encoded, budget = [], max_bytes - size
+                for record in chunk:
+                    item = (separator if written or encoded else "") + encode(record)
+                    budget -= len(item.encode("utf-8"))
+                    encoded.append(item)
+                    if budget <= 0:
+                        break
+                data = "".join(encoded).encode("utf-8")
+                count = len(encoded)
+            else:
+                data = ((separator if written else "") + separator.join(map(encode, chunk))).encode("utf-8")
+                count = len(chunk)
+            size += f.write(data)
+            written += count
+        size += f.write(footer.encode("utf-8"))
+    return written, size
+
+
+def _parse_size(text: str) -> int:
+    """'1500', '64K', '500M' or '1G' as a number of bytes."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def write_jsonl(file_path: str, records: Iterable[Dict], batch_size: int = BATCH_SIZE) -> int:
+    """Write one JSON object per line; returns the number of records written."""
+    import json
+    from itertools import islice
+    encode = json.JSONEncoder(ensure_ascii=False, check_circular=False).encode
+    written = 0
+    iterator = iter(records)
+    with open(file_path, "w", encoding="utf-8") as f:
+        while True:
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                return written
+            f.write("\n".join(map(encode, chunk)) + "\n")
+            written += len(chunk)
+
+
+def iter_jsonl(file_path: str) -> Iterator[Dict]:
+    """Read records back from a JSON Lines file."""
+    import json
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: List[str] | None = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate reproducible test data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dicts = commands.add_parser("dicts", help="random dicts as JSON Lines")
+    dicts.add_argument("count", type=int)
+    dicts.add_argument("--seed", type=int, default=0)
+    dicts.add_argument("--min-keys", type=int, default=1)
+    dicts.add_argument("--max-keys", type=int, default=5)
+    dicts.add_argument("--numpy", action="store_true", help="draw with a NumPy Generator")
+    dicts.add_argument("-o", "--output", default="dicts.jsonl")
+    inputs = commands.add_parser("inputs", help="news/ad/event input files for the ingest readers")
+    inputs.add_argument("--format", choices=list(INPUT_FORMATS), default="text")
+    limit = inputs.add_mutually_exclusive_group(required=True)
+    limit.add_argument("--count", type=int, help="number of records")
+    limit.add_argument("--size", type=_parse_size, help="approximate file size, e.g. 500M or 1G")
+    inputs.add_argument("--error-rate", type=float, default=0.0, help="share of broken records (0-1)")
+    inputs.add_argument("--errors", nargs="+", choices=ERROR_KINDS, default=list(ERROR_KINDS))
+    inputs.add_argument("--seed", type=int, default=0)
+    inputs.add_argument("-o", "--output", help="default: records.txt/.json/.xml")
+    args = parser.parse_args(argv)
+
+    if args.command == "dicts":
+        gen = DictGenerator(args.seed, args.min_keys, args.max_keys, use_numpy=args.numpy)
+        written = write_jsonl(args.output, gen.stream(args.count))
+        print(f"{written} dicts written to {args.output}")
+    elif args.command == "inputs":
+        output = args.output or f"records.{'txt' if args.format == 'text' else args.format}"
+        gen = InputRecordGenerator(args.seed, args.error_rate, tuple(args.errors))
+        written, size = write_input_file(output, gen.stream(args.count), args.format, args.size)
+        print(f"{written} records ({size} bytes) written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
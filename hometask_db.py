@@ -1,53 +1,78 @@
-import os
-import json
-import datetime
-import uuid
-import re
-import csv
-import sqlite3
-import xml.etree.ElementTree as ET
-from typing import List, Dict
+import contextlib
+from typing import List, Dict, Set
 
+import hometask_core
+from hometask_codes import EVENT_CODES
+from hometask_core import (
+    count_whitespaces,
+    extract_last_words,
+    fix_misspelling,
+    normalize_case,
+    process_text_summary as process_text,
+    update_csvs,
+    write_record,
+)
+from hometask_profile import PROFILER, enable_from_argv, profiled, stage
 
 
-def normalize_case(text: str) -> List[str]:
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-    return [s.capitalize() for s in sentences if s]
-
-
-def fix_misspelling(sentences: List[str]) -> List[str]:
-    return [re.sub(r'\biz\b', 'is', s, flags=re.IGNORECASE) for s in sentences]
-
-
-def extract_last_words(sentences: List[str]) -> str:
-    last_words = [s.rstrip('.!?').split()[-1] for s in sentences if s]
-    return " ".join(last_words).capitalize() + "."
-
-
-def count_whitespaces(text: str) -> int:
-    return sum(1 for c in text if c.isspace())
-
-
-def process_text(text: str) -> Dict[str, str | int]:
-    normalized = normalize_case(text)
-    fixed = fix_misspelling(normalized)
-    extra_sentence = extract_last_words(fixed)
-    final_text = " ".join(fixed) + " " + extra_sentence
-    whitespace_count = count_whitespaces(text)
-    return {"final_text": final_text, "whitespace_count": whitespace_count}
-
+# Sentinel telling the write-behind thread to stop after draining the queue.
+_STOP = object()
 
 
 class DatabaseHandler:
-    def __init__(self, db_path="news_feed.db"):
+    """
+    SQLite storage of published records.
+
+    By default every insert is committed before the call returns. With
+    write_behind=True inserts are put on a bounded queue and a writer
+    thread commits them in batched transactions; flush() waits for the
+    queue to drain and close() (also run at interpreter exit) stops the
+    writer after the last queued row is written.
+    """
+
+    # kind -> (table, duplicate check, insert statement)
+    STATEMENTS = {
+        "news": ("news", "text=? AND city=?",
+                 "INSERT INTO news (text, city, date) VALUES (?, ?, ?)"),
+        "ad": ("private_ads", "text=? AND exp_date=?",
+               "INSERT INTO private_ads (text, exp_date, days_left) VALUES (?, ?, ?)"),
+        "event": ("events", "name=? AND time=?",
+                  "INSERT INTO events (name, location, time, event_code) VALUES (?, ?, ?, ?)"),
+    }
+
+    # Read-side indexes; the trailing id keeps keyset pagination on the index.
+    INDEXES = (
+        "CREATE INDEX IF NOT EXISTS idx_news_city ON news (city, id)",
+        "CREATE INDEX IF NOT EXISTS idx_private_ads_exp_date ON private_ads (exp_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_events_time ON events (time, id)",
+        "CREATE INDEX IF NOT EXISTS idx_events_event_code ON events (event_code)",
+    )
+
+    def __init__(self, db_path="news_feed.db", write_behind=False, queue_size=10_000, batch_size=500):
         self.db_path = db_path
         self._initialize_db()
+        self._queue = None
+        self._writer = None
+        if write_behind:
+            self._start_writer(queue_size, batch_size)
 
     def _connect(self):
+        import sqlite3
         return sqlite3.connect(self.db_path)
 
+    @contextlib.contextmanager
+    def _connection(self):
+        """Short-lived connection: committed (or rolled back) and closed on exit."""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @profiled("db.initialize")
     def _initialize_db(self):
-        with self._connect() as conn:
+        with self._connection() as conn:
             c = conn.cursor()
             c.execute("""
                 CREATE TABLE IF NOT EXISTS news (
@@ -74,184 +99,250 @@ class DatabaseHandler:
                     event_code TEXT
                 )
             """)
+            for statement in self.INDEXES:
+                c.execute(statement)
+            self._initialize_search(c)
             conn.commit()
 
-    def _record_exists(self, table: str, where_clause: str, params: tuple) -> bool:
-        with self._connect() as conn:
-            c = conn.cursor()
-            query = f"SELECT 1 FROM {table} WHERE {where_clause} LIMIT 1"
-            c.execute(query, params)
-            return c.fetchone() is not None
+    # Full-text index over all three tables. rowid = id * 3 + kind, so the
+    # triggers find a source row's entry without scanning the index.
+    SEARCH_KINDS = {"news": 0, "private_ads": 1, "events": 2}
+    SEARCH_COLUMNS = {"news": ("text", "city"), "private_ads": ("text",), "events": ("name", "location")}
 
-    def insert_news(self, text, city, date):
-        if self._record_exists("news", "text=? AND city=?", (text, city)):
-            print("Duplicate news detected — not inserted.")
+    def _initialize_search(self, c):
+        """Create the FTS5 table and its sync triggers; skipped if SQLite lacks FTS5."""
+        import sqlite3
+        if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'records_fts'").fetchone():
             return
-        with self._connect() as conn:
-            conn.execute("INSERT INTO news (text, city, date) VALUES (?, ?, ?)",
-                         (text, city, date))
-            conn.commit()
-
-    def insert_private_ad(self, text, exp_date, days_left):
-        if self._record_exists("private_ads", "text=? AND exp_date=?", (text, exp_date)):
-            print("Duplicate ad detected — not inserted.")
+        try:
+            c.execute("CREATE VIRTUAL TABLE records_fts USING fts5(text, name, city, location)")
+        except sqlite3.OperationalError:
             return
-        with self._connect() as conn:
-            conn.execute("INSERT INTO private_ads (text, exp_date, days_left) VALUES (?, ?, ?)",
-                         (text, exp_date, days_left))
-            conn.commit()
+        for table, kind in self.SEARCH_KINDS.items():
+            columns = self.SEARCH_COLUMNS[table]
+            names = ", ".join(columns)
+            values = ", ".join(f"new.{column}" for column in columns)
+            insert = f"INSERT INTO records_fts (rowid, {names}) VALUES (new.id * 3 + {kind}, {values});"
+            delete = f"DELETE FROM records_fts WHERE rowid = old.id * 3 + {kind};"
+            c.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN {insert} END")
+            c.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN {delete} END")
+            c.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {names} ON {table} "
+                      f"BEGIN {delete} {insert} END")
+        self.rebuild_search_index(c)
+
+    @profiled("db.rebuild_search_index")
+    def rebuild_search_index(self, c=None):
+        """Repopulate records_fts from the source tables in bulk."""
+        if c is None:
+            with self._connection() as conn:
+                self.rebuild_search_index(conn.cursor())
+                conn.commit()
+            return
+        c.execute("DELETE FROM records_fts")
+        for table, kind in self.SEARCH_KINDS.items():
+            names = ", ".join(self.SEARCH_COLUMNS[table])
+            c.execute(f"INSERT INTO records_fts (rowid, {names}) SELECT id * 3 + {kind}, {names} FROM {table}")
+        c.execute("INSERT INTO records_fts (records_fts) VALUES ('optimize')")
+
+    def _write(self, conn, kind: str, key: tuple, params: tuple):
+        """Insert one row on `conn` unless an identical record is stored already."""
+        table, where_clause, insert = self.STATEMENTS[kind]
+        with stage("db.record_exists"):
+            exists = conn.execute(f"SELECT 1 FROM {table} WHERE {where_clause} LIMIT 1", key).fetchone()
+        if exists:
+            print(f"Duplicate {kind} detected — not inserted.")
+            PROFILER.count("db.duplicate")
+            return
+        conn.execute(insert, params)
+        PROFILER.count("db.inserted")
 
-    def insert_event(self, name, location, time_str, event_code):
-        if self._record_exists("events", "name=? AND time=?", (name, time_str)):
-            print("Duplicate event detected — not inserted.")
+    def _submit(self, kind: str, key: tuple, params: tuple):
+        if self._writer is not None:
+            self._queue.put((kind, key, params))
             return
-        with self._connect() as conn:
-            conn.execute("INSERT INTO events (name, location, time, event_code) VALUES (?, ?, ?, ?)",
-                         (name, location, time_str, event_code))
+        with self._connection() as conn:
+            self._write(conn, kind, key, params)
             conn.commit()
 
+    @profiled("db.insert_news")
+    def insert_news(self, text, city, date):
+        self._submit("news", (text, city), (text, city, date))
+
+    @profiled("db.insert_ad")
+    def insert_private_ad(self, text, exp_date, days_left):
+        self._submit("ad", (text, exp_date), (text, exp_date, days_left))
 
+    @profiled("db.insert_event")
+    def insert_event(self, name, location, time_str, event_code):
+        self._submit("event", (name, time_str), (name, location, time_str, event_code))
+
+    # =========================
+    # WRITE-BEHIND MODE
+    # =========================
+
+    def _start_writer(self, queue_size: int, batch_size: int):
+        import atexit
+        import queue
+        import threading
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        # Daemon thread: interpreter shutdown runs close() via atexit, which
+        # drains the queue, instead of blocking on a non-daemon thread.
+        self._writer = threading.Thread(target=self._writer_loop, args=(max(1, batch_size),),
+                                        name="db-write-behind", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _writer_loop(self, batch_size: int):
+        import queue
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not _STOP and len(batch) < batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is _STOP
+                rows = batch[:-1] if stop else batch
+                if rows:
+                    self._write_batch(conn, rows)
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @profiled("db.write_batch")
+    def _write_batch(self, conn, rows: List[tuple]):
+        """Write queued rows in one transaction, falling back to one row at a time."""
+        try:
+            with conn:
+                for row in rows:
+                    self._write(conn, *row)
+        except Exception as e:
+            print(f"Batched DB write failed, retrying row by row: {e}")
+            for row in rows:
+                try:
+                    with conn:
+                        self._write(conn, *row)
+                except Exception as e:
+                    print(f"DB write failed for {row[0]} record: {e}")
+
+    def flush(self):
+        """Block until every queued insert is committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        """Drain the queue and stop the writer; later inserts are written synchronously."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    @profiled("db.taken_event_codes")
+    def taken_event_codes(self, codes: List[str]) -> Set[str]:
+        """The subset of `codes` already used by stored events."""
+        taken = set()
+        with self._connection() as conn:
+            for start in range(0, len(codes), 500):
+                chunk = codes[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                taken.update(row[0] for row in conn.execute(
+                    f"SELECT event_code FROM events WHERE event_code IN ({marks})", chunk))
+        return taken
+
+    TABLES = ("news", "private_ads", "events")
+
+    @profiled("db.fetch_rows")
+    def fetch_rows(self, table: str, limit: int = 20) -> List[Dict]:
+        """Return the newest rows of a table as dicts."""
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        self.flush()
+        import sqlite3
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"SELECT * FROM {table} ORDER BY id DESC LIMIT ?", (limit,))
+            return [dict(row) for row in rows]
+
+
+_db_handler: DatabaseHandler | None = None
+_db_options: Dict[str, object] = {}
+
+
+def get_db_handler() -> DatabaseHandler:
+    """Shared DatabaseHandler, opened (and migrated) on first use, not at import."""
+    global _db_handler
+    if _db_handler is None:
+        _db_handler = DatabaseHandler(**_db_options)
+        # New event codes must not repeat ones already stored in this DB.
+        EVENT_CODES.set_taken(_db_handler.taken_event_codes)
+    return _db_handler
+
+
+def configure_db_handler(**options):
+    """Set DatabaseHandler options (e.g. write_behind=True) for the shared handler."""
+    close_db_handler()
+    _db_options.clear()
+    _db_options.update(options)
+
+
+def close_db_handler():
+    """Flush and close the shared handler; the next use opens a new one."""
+    global _db_handler
+    if _db_handler is not None:
+        _db_handler.close()
+        _db_handler = None
+        EVENT_CODES.set_taken(None)
+
+
+def __getattr__(name):
+    # Keeps `hometask_db.db_handler` working for existing callers.
+    if name == "db_handler":
+        return get_db_handler()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class DatabasePublisher(hometask_core.SummaryPublisher):
+    """Publishes like hometask_xml and also inserts every published record into the DB."""
 
-def write_record(file_path: str, content: str):
-    with open(file_path, "a", encoding="utf-8") as f:
-        f.write(content + "\n\n")
+    def before_publish(self):
+        get_db_handler()  # opened first so event codes are checked against the DB
 
+    def store_news(self, text: str, city: str, date: str):
+        get_db_handler().insert_news(text, city, date)
 
+    def store_ad(self, text: str, exp_date_str: str, days_left: int):
+        get_db_handler().insert_private_ad(text, exp_date_str, days_left)
 
-db_handler = DatabaseHandler()  # global instance
+    def store_event(self, name: str, location: str, time_str: str, event_code: str):
+        get_db_handler().insert_event(name, location, time_str, event_code)
 
-def publish_news(text: str, city: str, file_path: str):
-    text_data = process_text(text)
-    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-    record = f"News -------------------------\n{text_data['final_text']}\n{city}, {date}"
-    write_record(file_path, record)
-    db_handler.insert_news(text_data["final_text"], city, date)
-    print("News published!\n")
 
+DB_PUBLISHER = DatabasePublisher()
+publish_news = DB_PUBLISHER.publish_news
+publish_private_ad = DB_PUBLISHER.publish_private_ad
+publish_event = DB_PUBLISHER.publish_event
+publish_record = DB_PUBLISHER.publish_record
 
-def publish_private_ad(text: str, exp_date_str: str, file_path: str):
-    exp_date = datetime.datetime.strptime(exp_date_str, "%Y-%m-%d")
-    days_left = (exp_date - datetime.datetime.now()).days
-    text_data = process_text(text)
-    record = f"Private Ad -------------------\n{text_data['final_text']}\nExpires: {exp_date_str}, {days_left} days left"
-    write_record(file_path, record)
-    db_handler.insert_private_ad(text_data["final_text"], exp_date_str, days_left)
-    print("Private Ad published!\n")
 
+class TextFileInput(hometask_core.TextFileInput):
+    PUBLISHER = DB_PUBLISHER
 
-def publish_event(name: str, location: str, time_str: str, file_path: str):
-    event_time = datetime.datetime.strptime(time_str, "%Y-%m-%d %H:%M")
-    event_code = str(uuid.uuid4())[:8]
-    record = (f"Event ------------------------\n"
-              f"Event: {name}\n"
-              f"Location: {location}\n"
-              f"Time: {event_time.strftime('%Y-%m-%d %H:%M')}\n"
-              f"Event Code: {event_code}")
-    write_record(file_path, record)
-    db_handler.insert_event(name, location, time_str, event_code)
-    print("Event published!\n")
 
+class JSONFileInput(hometask_core.JSONFileInput):
+    PUBLISHER = DB_PUBLISHER
 
 
-class TextFileInput:
-    def __init__(self, default_folder="inputs"):
-        self.default_folder = default_folder
-        os.makedirs(default_folder, exist_ok=True)
+class XMLFileInput(hometask_core.XMLFileInput):
+    PUBLISHER = DB_PUBLISHER
 
-    def process_file(self, file_path=None, output_file="news_feed.txt"):
-        file_path = file_path or os.path.join(self.default_folder, "records.txt")
-        if not os.path.exists(file_path):
-            print(f"File {file_path} not found.")
-            return
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = f.read().strip()
-        publish_news(data, "Unknown City", output_file)
-        os.remove(file_path)
-        print("Text file processed successfully.")
-
-
-class JSONFileInput:
-    def __init__(self, default_folder="inputs"):
-        self.default_folder = default_folder
-        os.makedirs(default_folder, exist_ok=True)
-
-    def process_file(self, file_path=None, output_file="news_feed.txt"):
-        file_path = file_path or os.path.join(self.default_folder, "records.json")
-        if not os.path.exists(file_path):
-            print(f"File {file_path} not found.")
-            return
-        with open(file_path, "r", encoding="utf-8") as f:
-            records = json.load(f)
-        if not isinstance(records, list):
-            records = [records]
-        for rec in records:
-            rtype = rec.get("type", "").lower()
-            if rtype == "news":
-                publish_news(rec["text"], rec.get("city", "Unknown"), output_file)
-            elif rtype == "private_ad":
-                publish_private_ad(rec["text"], rec["exp_date"], output_file)
-            elif rtype == "event":
-                publish_event(rec["name"], rec["location"], rec["time"], output_file)
-        os.remove(file_path)
-        print(f"JSON file {file_path} processed successfully.")
-
-
-class XMLFileInput:
-    def __init__(self, default_folder="inputs"):
-        self.default_folder = default_folder
-        os.makedirs(default_folder, exist_ok=True)
-
-    def process_file(self, file_path=None, output_file="news_feed.txt"):
-        file_path = file_path or os.path.join(self.default_folder, "records.xml")
-        if not os.path.exists(file_path):
-            print(f"File {file_path} not found.")
-            return
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        for rec in root.findall("record"):
-            rtype = rec.attrib.get("type", "").lower()
-            if rtype == "news":
-                publish_news(rec.findtext("text", ""), rec.findtext("city", "Unknown"), output_file)
-            elif rtype == "private_ad":
-                publish_private_ad(rec.findtext("text", ""), rec.findtext("exp_date", ""), output_file)
-            elif rtype == "event":
-                publish_event(rec.findtext("name", ""), rec.findtext("location", ""), rec.findtext("time", ""), output_file)
-        os.remove(file_path)
-        print(f"XML file {file_path} processed successfully.")
-
-
-
-def update_csvs(feed_path="news_feed.txt"):
-    if not os.path.exists(feed_path):
-        return
-    with open(feed_path, "r", encoding="utf-8") as f:
-        text = f.read()
-    words = re.findall(r'\b\w+\b', text.lower())
-    word_counts = {}
-    for w in words:
-        word_counts[w] = word_counts.get(w, 0) + 1
-    with open("word_count.csv", "w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["word", "count"])
-        writer.writerows(word_counts.items())
-    letters = [c for c in text if c.isalpha()]
-    letter_data = {}
-    for c in letters:
-        lower = c.lower()
-        if lower not in letter_data:
-            letter_data[lower] = {"count_all": 0, "count_upper": 0}
-        letter_data[lower]["count_all"] += 1
-        if c.isupper():
-            letter_data[lower]["count_upper"] += 1
-    with open("letter_count.csv", "w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["letter", "count_all", "count_uppercase", "percentage"])
-        total = sum(v["count_all"] for v in letter_data.values())
-        for letter, v in sorted(letter_data.items()):
-            perc = round((v["count_all"] / total) * 100, 2)
-            writer.writerow([letter, v["count_all"], v["count_upper"], perc])
-    print("CSV files updated.\n")
 
+class DelimitedTextFileInput(hometask_core.DelimitedTextFileInput):
+    PUBLISHER = DB_PUBLISHER
 
 
 def main():
@@ -304,4 +395,6 @@ def main():
 
 
 if __name__ == "__main__":
+    if "--write-behind" in enable_from_argv():
+        configure_db_handler(write_behind=True)
     main()
@@ -0,0 +1,130 @@
+import hashlib
+import os
+from typing import Dict
+
+from hometask_profile import profiled
+from hometask_records import Record, iter_feed_records
+
+
+DIGEST_SIZE = 8  # 64-bit hashes: ~1e-6 collision odds at ten million records
+
+
+def record_digest(record: Record) -> bytes:
+    """Fast hash of the normalized (case/whitespace-insensitive) record identity."""
+    normalized = "\x1f".join(" ".join(part.split()).lower() for part in record.identity())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class DedupIndex:
+    """
+    Persistent set of content hashes of the records already in a feed.
+
+    Hashes live in memory for O(1) lookups and are appended to a binary
+    sidecar file (<feed>.dedup) as records are published. If the sidecar
+    or the active feed is missing, the index is rebuilt once from the feed
+    and its rotated segments.
+
+    Several processes may publish into one feed, so the index is loaded
+    lazily: publishers call refresh(), which also reads the hashes other
+    processes appended since, and check and add a hash while holding the
+    feed's append lock.
+    """
+
+    def __init__(self, feed_path: str):
+        self.feed_path = feed_path
+        self.index_path = feed_path + ".dedup"
+        self._hashes = set()
+        self._file = None
+        self._inode = None  # sidecar file the hashes were read from
+        self._offset = 0  # bytes of it already read
+        # No active feed: a deleted feed may still have rotated segments,
+        # so the first refresh() rebuilds the index rather than reading it.
+        self._rebuild_on_load = not os.path.exists(feed_path)
+
+    def refresh(self):
+        """Load or catch up with the sidecar; call it holding the feed lock."""
+        if self._rebuild_on_load:
+            self._rebuild_on_load = False
+            self.rebuild()
+            return
+        try:
+            f = open(self.index_path, "rb")
+        except FileNotFoundError:
+            self.rebuild()
+            return
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._inode:
+                # First load, or replaced by another process's rebuild().
+                self.close()
+                self._hashes, self._inode, self._offset = set(), inode, 0
+            f.seek(self._offset)
+            data = f.read()
+        usable = len(data) - len(data) % DIGEST_SIZE
+        if usable != len(data):
+            # Drop a torn last write so later appends stay aligned.
+            os.truncate(self.index_path, self._offset + usable)
+        self._hashes.update(data[i:i + DIGEST_SIZE] for i in range(0, usable, DIGEST_SIZE))
+        self._offset += usable
+
+    @profiled("dedup.rebuild")
+    def rebuild(self):
+        """Recreate the index from the records in the feed and its segments."""
+        from hometask_feed import SegmentedFeed
+        hashes = set()
+        feed = SegmentedFeed(self.feed_path)
+        for path in feed.all_paths():
+            if os.path.exists(path):
+                with feed.open_text(path) as f:
+                    hashes.update(record_digest(rec) for rec in iter_feed_records(f))
+        self.close()
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(hashes))
+        os.replace(tmp_path, self.index_path)
+        self._hashes = hashes
+        self._inode = os.stat(self.index_path).st_ino
+        self._offset = len(hashes) * DIGEST_SIZE
+
+    def digest(self, record: Record) -> bytes:
+        return record_digest(record)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, digest: bytes):
+        """Remember a published record; call after the feed append, still under the feed lock."""
+        if digest in self._hashes:
+            return
+        if self._file is None:
+            self._file = open(self.index_path, "ab", buffering=0)
+        self._file.write(digest)
+        self._hashes.add(digest)
+        self._offset += DIGEST_SIZE
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_indexes: Dict[str, DedupIndex] = {}
+
+
+def get_dedup_index(feed_path: str) -> DedupIndex:
+    """Shared DedupIndex per feed file, loaded on first use."""
+    key = os.path.abspath(feed_path)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = DedupIndex(feed_path)
+    return index
+
+
+def close_dedup_indexes():
+    """Close and forget every cached index, e.g. before switching working directories."""
+    for index in _indexes.values():
+        index.close()
+    _indexes.clear()
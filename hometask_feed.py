@@ -0,0 +1,261 @@
+import datetime
+import json
+import os
+from typing import Dict, List
+
+from hometask_feedlock import committed_size, feed_lock
+from hometask_profile import profiled
+from hometask_stats import FeedStats
+
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+# Limits feed_statistics() rotates with. Rotation is opt-in: with no limit set
+# (the default) statistics refreshes never move the feed into segments.
+_rotation_options: Dict[str, object] = {}
+
+
+class SegmentedFeed:
+    """
+    Rotates a feed file (news_feed.txt) into numbered, immutable segments.
+
+    Publishers keep appending to the active feed. Once it grows past
+    `max_bytes` (or gets older than `max_age`), it is moved to
+    <feed>_segments/00001.txt, 00002.txt, ... and its statistics are
+    counted exactly once and saved next to it. Statistics of the whole
+    feed are then the saved running total plus a count of the active file.
+    The statistics refreshes (feed_statistics) only rotate once
+    configure_rotation() set a limit, e.g. from hometask_cli --rotate-mb.
+
+    <feed>_segments/manifest.json:
+    {
+      "active_since": "2025-11-12T09:30:00",
+      "segments": [
+        {"id": 1, "file": "00001.txt.gz", "stats": "00001.stats.json",
+         "bytes": 10485812, "created": "2025-11-12T09:30:00", "compressed": true,
+         "inode": 1837261}
+      ]
+    }
+
+    rotate() adds the segment's entry with "pending": true before it moves
+    the active feed, and completes the entry once the segment is counted
+    (and compressed). Rotations hold <feed>_segments/rotate.lock; a
+    pending entry found while nobody holds it is left over from a crash
+    and is finished, or dropped if the feed was never moved.
+    """
+
+    MANIFEST = "manifest.json"
+    TOTALS = "totals.stats.json"
+    ROTATE_LOCK = "rotate.lock"
+
+    def __init__(self, feed_path: str = "news_feed.txt", max_bytes: int | None = DEFAULT_MAX_BYTES,
+                 max_age: datetime.timedelta | None = None, compress: bool = False):
+        self.feed_path = feed_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.segments_dir = os.path.splitext(feed_path)[0] + "_segments"
+
+    # ---------- MANIFEST ----------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.segments_dir, name)
+
+    def _read_manifest(self) -> Dict:
+        path = self._path(self.MANIFEST)
+        if not os.path.exists(path):
+            return {"active_since": None, "segments": []}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_manifest(self) -> Dict:
+        """The manifest, with any interrupted rotation finished first."""
+        manifest = self._read_manifest()
+        if any(seg.get("pending") for seg in manifest["segments"]):
+            # Waits for a rotation in progress to complete its entry.
+            with self._rotation_lock():
+                manifest = self._read_manifest()
+                self._recover(manifest)
+        return manifest
+
+    def _save_manifest(self, manifest: Dict):
+        os.makedirs(self.segments_dir, exist_ok=True)
+        path = self._path(self.MANIFEST)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def segment_paths(self) -> List[str]:
+        """Finished segment files, oldest first."""
+        return [self._path(seg["file"]) for seg in self.load_manifest()["segments"]]
+
+    def all_paths(self) -> List[str]:
+        """Finished segments followed by the active feed."""
+        return self.segment_paths() + [self.feed_path]
+
+    @staticmethod
+    def open_text(path: str):
+        """Open a segment or the active feed for reading, gzip-aware."""
+        if path.endswith(".gz"):
+            import gzip
+            return gzip.open(path, "rt", encoding="utf-8")
+        return open(path, "r", encoding="utf-8")
+
+    # ---------- ROTATION ----------
+
+    def _rotation_lock(self):
+        os.makedirs(self.segments_dir, exist_ok=True)
+        lock_path = self._path(self.ROTATE_LOCK)
+        if not os.path.exists(lock_path):
+            open(lock_path, "a").close()
+        return feed_lock(lock_path)
+
+    def _finish_segment(self, seg: Dict) -> FeedStats:
+        """Count (and compress) a moved segment and complete its pending entry."""
+        seg_path = self._path(seg["file"])
+        stats_path = self._path(seg["stats"])
+        if os.path.exists(seg_path):
+            seg_stats = FeedStats.from_file(seg_path)
+            seg_stats.save(stats_path)
+            if seg["compressed"]:
+                import gzip
+                import shutil
+                with open(seg_path, "rb") as src, gzip.open(seg_path + ".gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(seg_path)
+        else:
+            # Only the .gz is left: the stats were saved before compressing.
+            seg_stats = FeedStats.load(stats_path)
+        if seg["compressed"]:
+            seg["file"] += ".gz"
+        seg["created"] = datetime.datetime.now().isoformat(timespec="seconds")
+        del seg["pending"]
+        return seg_stats
+
+    def _recover(self, manifest: Dict):
+        """Finish or drop the pending entries of a crashed rotation (rotation lock held)."""
+        pending = [seg for seg in manifest["segments"] if seg.get("pending")]
+        if not pending:
+            return
+        for seg in pending:
+            seg_path = self._path(seg["file"])
+            if os.path.exists(seg_path) or os.path.exists(seg_path + ".gz"):
+                print(f"Finishing interrupted rotation into segment {seg_path}")
+                self._finish_segment(seg)
+            else:
+                manifest["segments"].remove(seg)
+        self._save_manifest(manifest)
+        self._save_totals(self._load_totals(manifest["segments"]), len(manifest["segments"]))
+
+    def needs_rotation(self, manifest: Dict | None = None) -> bool:
+        if not os.path.exists(self.feed_path):
+            return False
+        size = os.path.getsize(self.feed_path)
+        if size == 0:
+            return False
+        if self.max_bytes is not None and size >= self.max_bytes:
+            return True
+        if self.max_age is not None:
+            manifest = manifest or self.load_manifest()
+            since = manifest.get("active_since")
+            if since is None:
+                # First time a time limit applies: start the clock now.
+                manifest["active_since"] = datetime.datetime.now().isoformat(timespec="seconds")
+                self._save_manifest(manifest)
+                return False
+            return datetime.datetime.now() - datetime.datetime.fromisoformat(since) >= self.max_age
+        return False
+
+    @profiled("feed.rotate")
+    def rotate(self) -> str | None:
+        """Close the active feed as the next segment. Returns the segment path."""
+        if not os.path.exists(self.feed_path) or os.path.getsize(self.feed_path) == 0:
+            return None
+        with self._rotation_lock():
+            manifest = self._read_manifest()
+            self._recover(manifest)
+            seg_id = manifest["segments"][-1]["id"] + 1 if manifest["segments"] else 1
+            # Never overwrite a segment left behind by an interrupted rotation.
+            while any(os.path.exists(self._path(f"{seg_id:05d}.txt{ext}")) for ext in ("", ".gz")):
+                seg_id += 1
+            seg_file = f"{seg_id:05d}.txt"
+            seg_path = self._path(seg_file)
+
+            # Under the feed lock no record is half written; writers reopen the new file.
+            with feed_lock(self.feed_path):
+                st = os.stat(self.feed_path)
+                # The inode lets incremental readers (hometask_windows) recognise
+                # the file they were reading once it is a segment.
+                seg = {"id": seg_id, "file": seg_file, "stats": f"{seg_id:05d}.stats.json",
+                       "bytes": st.st_size, "created": None, "compressed": self.compress,
+                       "inode": st.st_ino, "pending": True}
+                manifest["segments"].append(seg)
+                self._save_manifest(manifest)
+                os.replace(self.feed_path, seg_path)
+                # Keep an (empty) active feed so readers and the dedup index see it.
+                open(self.feed_path, "a", encoding="utf-8").close()
+
+            seg_stats = self._finish_segment(seg)
+            manifest["active_since"] = seg["created"]
+            self._save_manifest(manifest)
+            self._save_totals(self._load_totals(manifest["segments"][:-1]).update(seg_stats),
+                              len(manifest["segments"]))
+        seg_path = self._path(seg["file"])
+        print(f"Feed rotated into segment {seg_path}")
+        return seg_path
+
+    def rotate_if_needed(self) -> str | None:
+        if self.needs_rotation():
+            return self.rotate()
+        return None
+
+    # ---------- STATISTICS ----------
+
+    def _save_totals(self, totals: FeedStats, segment_count: int):
+        path = self._path(self.TOTALS)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"segments": segment_count, "stats": totals.to_dict()}, f)
+        os.replace(tmp_path, path)
+
+    def _load_totals(self, segments: List[Dict]) -> FeedStats:
+        """Merged statistics of the given finished segments.
+
+        Uses the cached running total when it covers exactly these segments,
+        otherwise merges the per-segment stats files.
+        """
+        path = self._path(self.TOTALS)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("segments") == len(segments):
+                return FeedStats.from_dict(data["stats"])
+        totals = FeedStats()
+        for seg in segments:
+            totals.update(FeedStats.load(self._path(seg["stats"])))
+        return totals
+
+    @profiled("stats.feed_statistics")
+    def statistics(self, rotate: bool = True) -> FeedStats:
+        """Whole-feed statistics: finished segments are never recounted."""
+        if rotate:
+            self.rotate_if_needed()
+        totals = self._load_totals(self.load_manifest()["segments"])
+        # Only whole records: an append from another process may be in progress.
+        return totals.update(FeedStats.from_file(self.feed_path, limit=committed_size(self.feed_path)))
+
+
+def configure_rotation(max_bytes: int | None = None, max_age: datetime.timedelta | None = None,
+                       compress: bool = False):
+    """Make feed_statistics() rotate the feed past `max_bytes` or `max_age`; no limits turn it off."""
+    _rotation_options.clear()
+    if max_bytes is not None or max_age is not None:
+        _rotation_options.update(max_bytes=max_bytes, max_age=max_age, compress=compress)
+
+
+def feed_statistics(feed_path: str) -> FeedStats:
+    """Statistics of the whole feed, rotating it first if configure_rotation() set a limit that is due."""
+    if not _rotation_options:
+        return SegmentedFeed(feed_path).statistics(rotate=False)
+    return SegmentedFeed(feed_path, **_rotation_options).statistics()
@@ -0,0 +1,130 @@
+"""
+Scheduled maintenance of private ads in news_feed.db.
+
+days_left is written once at publish time, so it goes stale every night.
+AdMaintenance.run() (meant for a daily cron job, or `hometask_cli.py
+maintain --every SECONDS`) fixes that incrementally:
+
+  1. expired ads (days_left < 0) are moved to private_ads_archive, or
+     deleted with purge=True, in batches along the exp_date index;
+  2. the remaining ads are updated one exp_date group at a time along the
+     index, and only rows whose stored days_left differs from today's value
+     are written. Later runs on the same day only check ads inserted since
+     the previous run.
+"""
+import datetime
+from typing import Dict
+
+from hometask_core import days_until
+from hometask_profile import profiled
+
+
+class AdMaintenance:
+    def __init__(self, db_path: str = "news_feed.db", batch_size: int = 1000):
+        import sqlite3
+        from hometask_db import DatabaseHandler
+        DatabaseHandler(db_path)  # creates the tables and the exp_date index if missing
+        self.batch_size = max(1, batch_size)
+        self._conn = sqlite3.connect(db_path)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS private_ads_archive (
+                    id INTEGER PRIMARY KEY,
+                    text TEXT,
+                    exp_date TEXT,
+                    days_left INTEGER,
+                    archived_at TEXT
+                )
+            """)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS maintenance_state (name TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _first_active_date(now: datetime.datetime) -> str:
+        """Smallest exp_date whose days_left is still >= 0 at `now`."""
+        day = now.date()
+        while days_until(datetime.datetime.combine(day, datetime.time()), now) < 0:
+            day += datetime.timedelta(days=1)
+        return day.isoformat()
+
+    @profiled("maintenance.archive_expired")
+    def archive_expired(self, now: datetime.datetime, purge: bool = False) -> int:
+        """Move (or delete) expired ads in batches; returns the number of rows removed."""
+        cutoff = self._first_active_date(now)
+        archived_at = now.strftime("%Y-%m-%d %H:%M")
+        removed = 0
+        while True:
+            with self._conn:
+                ids = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM private_ads WHERE exp_date < ? ORDER BY exp_date, id LIMIT ?",
+                    (cutoff, self.batch_size))]
+                if not ids:
+                    return removed
+                marks = ",".join("?" * len(ids))
+                if not purge:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO private_ads_archive (id, text, exp_date, days_left, archived_at) "
+                        f"SELECT id, text, exp_date, days_left, ? FROM private_ads WHERE id IN ({marks})",
+                        [archived_at] + ids)
+                self._conn.execute(f"DELETE FROM private_ads WHERE id IN ({marks})", ids)
+            removed += len(ids)
+
+    def _expected(self, exp_date: str, now: datetime.datetime, expected: Dict[str, int | None]) -> int | None:
+        if exp_date not in expected:
+            try:
+                expected[exp_date] = days_until(datetime.datetime.strptime(exp_date, "%Y-%m-%d"), now)
+            except (TypeError, ValueError):
+                expected[exp_date] = None  # malformed dates are left alone
+        return expected[exp_date]
+
+    @profiled("maintenance.refresh_days_left")
+    def refresh_days_left(self, now: datetime.datetime) -> int:
+        """Update days_left where it changed; returns the number of rows updated.
+
+        The first run of a day updates each exp_date group along the index,
+        touching only rows whose value is stale; later runs that day only
+        look at ads inserted since the previous run.
+        """
+        day = now.date().isoformat()
+        state = dict(self._conn.execute("SELECT name, value FROM maintenance_state"))
+        last_id = int(state.get("days_left_max_id", 0)) if state.get("days_left_date") == day else 0
+        max_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM private_ads").fetchone()[0]
+        expected: Dict[str, int | None] = {}
+        updated = 0
+        if last_id:
+            while True:
+                rows = self._conn.execute(
+                    "SELECT id, exp_date, days_left FROM private_ads WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                    (last_id, max_id, self.batch_size)).fetchall()
+                if not rows:
+                    break
+                changes = [(value, row_id) for row_id, exp_date, days_left in rows
+                           if (value := self._expected(exp_date, now, expected)) is not None and value != days_left]
+                if changes:
+                    with self._conn:
+                        self._conn.executemany("UPDATE private_ads SET days_left = ? WHERE id = ?", changes)
+                updated += len(changes)
+                last_id = rows[-1][0]
+        else:
+            dates = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT exp_date FROM private_ads WHERE exp_date IS NOT NULL ORDER BY exp_date")]
+            for start in range(0, len(dates), self.batch_size):
+                with self._conn:
+                    for exp_date in dates[start:start + self.batch_size]:
+                        value = self._expected(exp_date, now, expected)
+                        if value is not None:
+                            updated += self._conn.execute(
+                                "UPDATE private_ads SET days_left = ? WHERE exp_date = ? AND days_left IS NOT ?",
+                                (value, exp_date, value)).rowcount
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO maintenance_state (name, value) VALUES (?, ?)",
+                                   [("days_left_date", day), ("days_left_max_id", str(max_id))])
+        return updated
+
+    def run(self, now: datetime.datetime | None = None, purge: bool = False) -> Dict[str, int]:
+        """Archive expired ads, then bring days_left up to date."""
+        now = now or datetime.datetime.now()
+        removed = self.archive_expired(now, purge)
+        return {"purged" if purge else "archived": removed, "updated": self.refresh_days_left(now)}
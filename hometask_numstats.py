@@ -0,0 +1,216 @@
+"""
+Streaming even/odd statistics for integer samples.
+
+One pass over any iterable of ints (or a binary int file read through
+mmap) gives count, sum, average, min and max of the even and of the odd
+numbers, plus optional percentiles:
+
+    stats = parity_stats(numbers)
+    stats.even.average, stats.odd.max
+    parity_stats(numbers, percentiles=True).even.percentile(90)
+    parity_stats_file("numbers.bin")            # native 64-bit ints
+
+Values are consumed in chunks of CHUNK_SIZE; each chunk is counted with
+Counter in C and only its distinct values are folded into the running
+totals, so bounded samples (such as the 0-1000 numbers of Hometask.py) cost
+little more than one C-level pass. Memory stays at one chunk unless
+percentiles are requested, which keep a value -> count histogram.
+NumPy arrays (and np.memmap files) take a vectorized path when NumPy is
+installed.
+"""
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+CHUNK_SIZE = 1 << 16
+
+
+class GroupStats:
+    """Running statistics of one parity group."""
+
+    __slots__ = ("count", "total", "min", "max", "histogram")
+
+    def __init__(self, keep_histogram: bool = False):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.histogram: Counter | None = Counter() if keep_histogram else None
+
+    def __repr__(self):
+        return (f"GroupStats(count={self.count}, total={self.total}, "
+                f"min={self.min}, max={self.max})")
+
+    @property
+    def average(self) -> float:
+        """Mean of the group, 0 when it is empty (as in Hometask.py)."""
+        return self.total / self.count if self.count else 0
+
+    def add(self, value: int, count: int):
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.histogram is not None:
+            self.histogram[value] += count
+
+    def percentile(self, p: float) -> float | None:
+        """p-th percentile with linear interpolation (NumPy's default method)."""
+        if self.histogram is None:
+            raise ValueError("Percentiles need parity_stats(..., percentiles=True)")
+        if not self.count:
+            return None
+        position = (self.count - 1) * p / 100
+        below = int(position)
+        low = high = None
+        seen = 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if low is None and seen > below:
+                low = value
+            if seen > below + 1 or seen == self.count:
+                high = value
+                break
+        return low + (high - low) * (position - below)
+
+    def as_dict(self, percentiles: Iterable[float] = ()) -> Dict[str, float | int | None]:
+        result = {"count": self.count, "sum": self.total, "average": self.average,
+                  "min": self.min, "max": self.max}
+        for p in percentiles:
+            result[f"p{p:g}"] = self.percentile(p)
+        return result
+
+
+class ParityStats:
+    """Even and odd GroupStats updated together from chunks of numbers."""
+
+    __slots__ = ("even", "odd")
+
+    def __init__(self, percentiles: bool = False):
+        self.even = GroupStats(percentiles)
+        self.odd = GroupStats(percentiles)
+
+    def __repr__(self):
+        return f"ParityStats(even={self.even!r}, odd={self.odd!r})"
+
+    def add_chunk(self, values: Iterable[int]):
+        for value, count in Counter(values).items():
+            (self.odd if value % 2 else self.even).add(value, count)
+
+    def update(self, values: Iterable[int], chunk_size: int = CHUNK_SIZE) -> "ParityStats":
+        if isinstance(values, (list, tuple)):
+            # Already in memory: slicing is cheaper than islice().
+            for start in range(0, len(values), chunk_size):
+                self.add_chunk(values[start:start + chunk_size])
+            return self
+        iterator = iter(values)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return self
+            self.add_chunk(chunk)
+
+    def as_dict(self, percentiles: Iterable[float] = ()) -> Dict[str, Dict]:
+        percentiles = tuple(percentiles)
+        return {"even": self.even.as_dict(percentiles), "odd": self.odd.as_dict(percentiles)}
+
+
+def _numpy_stats(array, percentiles: bool) -> ParityStats:
+    import numpy as np
+    if array.dtype.kind not in "iu":
+        raise ValueError(f"Even/odd statistics need an integer array, got {array.dtype}")
+    stats = ParityStats(percentiles)
+    odd_mask = (array & 1).astype(bool)
+    for group, values in ((stats.even, array[~odd_mask]), (stats.odd, array[odd_mask])):
+        if not values.size:
+            continue
+        group.count = int(values.size)
+        group.total = int(values.sum(dtype=np.int64 if array.dtype.kind == "i" else np.uint64))
+        group.min = int(values.min())
+        group.max = int(values.max())
+        if percentiles:
+            uniques, counts = np.unique(values, return_counts=True)
+            group.histogram = Counter(dict(zip(uniques.tolist(), counts.tolist())))
+    return stats
+
+
+def parity_stats(values, percentiles: bool = False, chunk_size: int = CHUNK_SIZE) -> ParityStats:
+    """Even/odd statistics of `values` in one pass (vectorized for NumPy arrays)."""
+    if type(values).__module__.startswith("numpy"):
+        return _numpy_stats(values, percentiles)
+    return ParityStats(percentiles).update(values, chunk_size)
+
+
+# =========================
+# BINARY INT FILES
+# =========================
+
+def write_int_file(file_path: str, values: Iterable[int], typecode: str = "q",
+                   chunk_size: int = CHUNK_SIZE):
+    """Write ints as native machine values (array typecode, default 64-bit)."""
+    from array import array
+    iterator = iter(values)
+    with open(file_path, "wb") as f:
+        while True:
+            chunk = array(typecode, islice(iterator, chunk_size))
+            if not chunk:
+                return
+            chunk.tofile(f)
+
+
+def iter_int_file(file_path: str, typecode: str = "q", chunk_size: int = CHUNK_SIZE) -> Iterator[List[int]]:
+    """Chunks of ints read from a memory-mapped file written by write_int_file."""
+    import mmap
+    with open(file_path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file
+        with mapped:
+            view = memoryview(mapped).cast("B").cast(typecode)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    yield view[start:start + chunk_size].tolist()
+            finally:
+                view.release()
+
+
+def parity_stats_file(file_path: str, typecode: str = "q", percentiles: bool = False,
+                      chunk_size: int = CHUNK_SIZE, use_numpy: bool | None = None) -> ParityStats:
+    """parity_stats() over a binary int file; np.memmap is used when NumPy is available."""
+    if use_numpy is not False:
+        try:
+            import numpy as np
+        except ImportError:
+            if use_numpy:
+                raise
+        else:
+            import os
+            if not os.path.getsize(file_path):
+                return ParityStats(percentiles)
+            return _numpy_stats(np.memmap(file_path, dtype=typecode, mode="r"), percentiles)
+    stats = ParityStats(percentiles)
+    for chunk in iter_int_file(file_path, typecode, chunk_size):
+        stats.add_chunk(chunk)
+    return stats
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    numbers = [random.randint(0, 1000) for _ in range(size)]
+    start = time.perf_counter()
+    even_numbers = [num for num in numbers if num % 2 == 0]
+    odd_numbers = [num for num in numbers if num % 2 != 0]
+    lists = (sum(even_numbers) / len(even_numbers), sum(odd_numbers) / len(odd_numbers))
+    list_time = time.perf_counter() - start
+    start = time.perf_counter()
+    stats = parity_stats(numbers)
+    stream_time = time.perf_counter() - start
+    assert lists == (stats.even.average, stats.odd.average)
+    print(f"{size} numbers: lists {list_time * 1000:.1f}ms, parity_stats {stream_time * 1000:.1f}ms")
+    print(parity_stats(numbers, percentiles=True).as_dict((50, 90, 99)))
@@ -0,0 +1,180 @@
+import atexit
+import functools
+import sys
+import time
+from array import array
+from typing import Callable, Dict, List
+
+DEFAULT_REPORT_PATH = "profile_report.json"
+
+
+class _NullStage:
+    """Shared no-op context manager handed out while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _histogram(samples: List[float]) -> Dict[str, int]:
+    """Power-of-two latency buckets in microseconds."""
+    buckets: Dict[int, int] = {}
+    for s in samples:
+        bound = 1
+        us = s * 1_000_000
+        while bound < us:
+            bound <<= 1
+        buckets[bound] = buckets.get(bound, 0) + 1
+    return {f"<={bound}us": buckets[bound] for bound in sorted(buckets)}
+
+
+class Profiler:
+    """
+    Collects per-stage latencies of the publish, ingest, DB and statistics
+    paths. Disabled by default: instrumented code then only pays for one
+    attribute check per call.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report_path = DEFAULT_REPORT_PATH
+        self._samples: Dict[str, array] = {}
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Callable[[], Dict]] = {}
+        self._started = 0.0
+
+    def enable(self, report_path: str = DEFAULT_REPORT_PATH):
+        """Start collecting; the JSON report is written at interpreter exit."""
+        if not self.enabled:
+            atexit.register(self.write_report)
+        self.enabled = True
+        self.report_path = report_path
+        self._started = time.perf_counter()
+
+    def stage(self, name: str):
+        """Context manager timing one stage: `with PROFILER.stage("feed.append"): ...`"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = array("d")
+        samples.append(seconds)
+
+    def count(self, name: str, n: int = 1):
+        """Add `n` to a counter, e.g. "records.published" or "records.duplicate"."""
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def add_gauge(self, name: str, read: Callable[[], Dict]):
+        """Include `read()` (e.g. cache counters kept by other modules) in every report."""
+        self._gauges[name] = read
+
+    def report(self) -> Dict:
+        wall = time.perf_counter() - self._started if self._started else 0.0
+        stages = {}
+        for name, samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            total = sum(ordered)
+            stages[name] = {
+                "calls": len(ordered),
+                "total_s": round(total, 6),
+                "mean_ms": round(total / len(ordered) * 1000, 4),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 4),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 4),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 4),
+                "max_ms": round(ordered[-1] * 1000, 4),
+                "calls_per_sec": round(len(ordered) / total, 2) if total else None,
+                "histogram": _histogram(ordered),
+            }
+        published = self._counters.get("records.published", 0)
+        return {
+            "wall_time_s": round(wall, 6),
+            "records_published": published,
+            "records_per_sec": round(published / wall, 2) if wall else None,
+            "counters": dict(sorted(self._counters.items())),
+            "gauges": {name: read() for name, read in sorted(self._gauges.items())},
+            "stages": stages,
+        }
+
+    def write_report(self, path: str | None = None):
+        import json
+        path = path or self.report_path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"Profile report written to {path}")
+
+
+PROFILER = Profiler()
+
+
+def stage(name: str):
+    """Time a block of code under `name` when profiling is on."""
+    return PROFILER.stage(name)
+
+
+def profiled(name: str):
+    """Decorator timing every call of a function as stage `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def enable_from_argv(argv: List[str] | None = None) -> List[str]:
+    """Turn profiling on for `--profile` or `--profile=<report.json>`.
+
+    Returns the remaining arguments.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    rest = []
+    for arg in argv:
+        if arg == "--profile":
+            PROFILER.enable()
+        elif arg.startswith("--profile="):
+            PROFILER.enable(arg.split("=", 1)[1] or DEFAULT_REPORT_PATH)
+        else:
+            rest.append(arg)
+    return rest
@@ -0,0 +1,83 @@
+"""
+Atomic publication of the statistics CSVs.
+
+Dashboards poll word_count.csv, letter_count.csv and letter_stat.csv while
+the ingest front ends regenerate them. publish_csv() renders the CSV in
+memory, writes it to a temp file next to the target and os.replace()s it
+in, so a reader sees either the previous or the new file, never a
+truncated one.
+
+Every CSV has a small JSON sidecar, <csv>.version:
+
+    {"version": 7, "etag": "3f1c9a0e5b2d4c61", "bytes": 18342, "updated": "2025-11-12T09:30:00"}
+
+`etag` is a hash of the CSV bytes and `version` grows by one per published
+change. When the rendered CSV has the etag that is already published,
+neither file is touched, so unchanged counters cost no write and readers
+comparing the sidecar (or the CSV mtime) see no change. The sidecar is
+replaced after the CSV, so a new etag always refers to a CSV that is
+already in place.
+"""
+import csv
+import datetime
+import hashlib
+import io
+import json
+import os
+from typing import Dict, Iterable, List
+
+ETAG_SIZE = 8
+
+
+def version_path(csv_path: str) -> str:
+    return csv_path + ".version"
+
+
+def csv_version(csv_path: str) -> Dict | None:
+    """Published version info of a CSV, or None if it has none (yet)."""
+    try:
+        with open(version_path(csv_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def render_csv(header: List[str], rows: Iterable[Iterable]) -> bytes:
+    """CSV bytes exactly as csv.writer on a newline='' UTF-8 file writes them."""
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _write_atomic(path: str, data: bytes):
+    # The pid keeps concurrent publishers off each other's temp files.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def publish_csv(path: str, header: List[str], rows: Iterable[Iterable]) -> bool:
+    """Atomically replace `path` with the CSV; False if it was already up to date."""
+    data = render_csv(header, rows)
+    etag = hashlib.blake2b(data, digest_size=ETAG_SIZE).hexdigest()
+    published = csv_version(path)
+    if published and published.get("etag") == etag and os.path.exists(path):
+        return False
+    _write_atomic(path, data)
+    info = {
+        "version": (published or {}).get("version", 0) + 1,
+        "etag": etag,
+        "bytes": len(data),
+        "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    _write_atomic(version_path(path), json.dumps(info).encode("utf-8"))
+    return True
@@ -0,0 +1,201 @@
+"""
+Read-side queries over news_feed.db.
+
+Every query comes in two forms:
+  * a page method returning at most `page_size` rows plus the cursor of the
+    next page (keyset pagination: the cursor holds the sort key of the last
+    row, so page N costs the same as page 1);
+  * an iter_* generator streaming every matching row with fetchmany, so
+    memory stays constant however many rows match.
+
+Both walk the indexes created by DatabaseHandler (news.city, private_ads.exp_date,
+events.time, each followed by id). search() ranks matches from the records_fts
+full-text index and falls back to LIKE scans where SQLite has no FTS5.
+"""
+import datetime
+from typing import Dict, Iterator, List, Tuple
+
+from hometask_profile import profiled
+
+Cursor = Tuple
+
+
+class Page:
+    """One page of rows; `next_cursor` is None on the last page."""
+
+    __slots__ = ("rows", "next_cursor")
+
+    def __init__(self, rows: List[Dict], next_cursor: Cursor | None):
+        self.rows = rows
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class FeedQueries:
+    def __init__(self, db_path: str = "news_feed.db", page_size: int = 100, fetch_size: int = 500):
+        import sqlite3
+        from hometask_db import DatabaseHandler
+        self._handler = DatabaseHandler(db_path)  # creates the tables and indexes if missing
+        self.page_size = page_size
+        self.fetch_size = fetch_size
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self.has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'").fetchone() is not None
+
+    def close(self):
+        self._conn.close()
+        self._handler.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # =========================
+    # SHARED HELPERS
+    # =========================
+
+    def _page(self, sql: str, params: tuple, key: Tuple[str, ...], limit: int | None) -> Page:
+        limit = limit or self.page_size
+        # One extra row tells whether another page exists.
+        rows = [dict(row) for row in self._conn.execute(f"{sql} LIMIT ?", params + (limit + 1,))]
+        if len(rows) <= limit:
+            return Page(rows, None)
+        rows = rows[:limit]
+        return Page(rows, tuple(rows[-1][column] for column in key))
+
+    def _stream(self, sql: str, params: tuple) -> Iterator[Dict]:
+        cursor = self._conn.execute(sql, params)
+        try:
+            while True:
+                batch = cursor.fetchmany(self.fetch_size)
+                if not batch:
+                    return
+                for row in batch:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    # =========================
+    # NEWS BY CITY (newest first)
+    # =========================
+
+    @staticmethod
+    def _news_sql(after: Cursor | None) -> str:
+        keyset = " AND id < ?" if after else ""
+        return f"SELECT * FROM news WHERE city = ?{keyset} ORDER BY id DESC"
+
+    @profiled("query.recent_news")
+    def recent_news(self, city: str, after: Cursor | None = None, limit: int | None = None) -> Page:
+        """Newest news of a city; pass the previous page's next_cursor as `after`."""
+        params = (city,) + (tuple(after) if after else ())
+        return self._page(self._news_sql(after), params, ("id",), limit)
+
+    def iter_recent_news(self, city: str) -> Iterator[Dict]:
+        return self._stream(self._news_sql(None), (city,))
+
+    # =========================
+    # ADS EXPIRING SOON (soonest first)
+    # =========================
+
+    @staticmethod
+    def _expiring_sql(after: Cursor | None) -> str:
+        # After a cursor the range starts at its exp_date; SQLite does not
+        # seek an index with a row-value comparison such as (exp_date, id) > (?, ?).
+        keyset = " AND (exp_date > ? OR id > ?)" if after else ""
+        return ("SELECT * FROM private_ads WHERE exp_date >= ? AND exp_date <= ?"
+                f"{keyset} ORDER BY exp_date, id")
+
+    @staticmethod
+    def _expiry_range(days: int, today: datetime.date | None) -> tuple:
+        today = today or datetime.date.today()
+        return (today.isoformat(), (today + datetime.timedelta(days=days)).isoformat())
+
+    @profiled("query.ads_expiring")
+    def ads_expiring_within(self, days: int, after: Cursor | None = None, limit: int | None = None,
+                            today: datetime.date | None = None) -> Page:
+        """Ads that have not expired yet and expire within `days` days."""
+        start, end = self._expiry_range(days, today)
+        params = (max(start, after[0]), end) + tuple(after) if after else (start, end)
+        return self._page(self._expiring_sql(after), params, ("exp_date", "id"), limit)
+
+    def iter_ads_expiring_within(self, days: int, today: datetime.date | None = None) -> Iterator[Dict]:
+        return self._stream(self._expiring_sql(None), self._expiry_range(days, today))
+
+    # =========================
+    # EVENTS IN A TIME WINDOW (earliest first)
+    # =========================
+
+    @staticmethod
+    def _events_sql(after: Cursor | None) -> str:
+        keyset = " AND (time > ? OR id > ?)" if after else ""
+        return f"SELECT * FROM events WHERE time >= ? AND time < ?{keyset} ORDER BY time, id"
+
+    @profiled("query.events_between")
+    def events_between(self, start: str, end: str, after: Cursor | None = None,
+                       limit: int | None = None) -> Page:
+        """Events with start <= time < end ('YYYY-MM-DD HH:MM' strings or prefixes)."""
+        params = (max(start, after[0]), end) + tuple(after) if after else (start, end)
+        return self._page(self._events_sql(after), params, ("time", "id"), limit)
+
+    def iter_events_between(self, start: str, end: str) -> Iterator[Dict]:
+        return self._stream(self._events_sql(None), (start, end))
+
+    # =========================
+    # FULL-TEXT SEARCH
+    # =========================
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """Every word of a plain query must match; quoting keeps FTS5 operators literal."""
+        return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+    @profiled("query.search")
+    def search(self, query: str, limit: int = 20, raw: bool = False) -> List[Dict]:
+        """Records matching all words of `query` in text, name, city or location, best first.
+
+        raw=True passes `query` to FTS5 unchanged (phrases, prefix*, OR, NEAR).
+        Rows carry `kind` (the source table), `id` and the indexed columns.
+        """
+        if not self.has_fts:
+            return self.search_like(query, limit)
+        match = query if raw else self._match_expression(query)
+        if not match:
+            return []
+        kinds = {kind: table for table, kind in self._handler.SEARCH_KINDS.items()}
+        rows = self._conn.execute(
+            "SELECT rowid, text, name, city, location, bm25(records_fts) AS rank FROM records_fts "
+            "WHERE records_fts MATCH ? ORDER BY rank LIMIT ?", (match, limit))
+        results = []
+        for row in rows:
+            table = kinds[row["rowid"] % 3]
+            result = {"kind": table, "id": row["rowid"] // 3}
+            result.update((column, row[column]) for column in self._handler.SEARCH_COLUMNS[table])
+            result["rank"] = row["rank"]
+            results.append(result)
+        return results
+
+    def search_like(self, query: str, limit: int = 20) -> List[Dict]:
+        """The same search as LIKE scans over the source tables (unranked)."""
+        words = query.split()
+        results = []
+        for table, columns in self._handler.SEARCH_COLUMNS.items():
+            if not words or len(results) >= limit:
+                break
+            haystack = " || ' ' || ".join(f"COALESCE({column}, '')" for column in columns)
+            where = " AND ".join(f"({haystack}) LIKE ?" for _ in words)
+            rows = self._conn.execute(f"SELECT id, {', '.join(columns)} FROM {table} WHERE {where} LIMIT ?",
+                                      tuple(f"%{word}%" for word in words) + (limit - len(results),))
+            results.extend(dict(row, kind=table) for row in rows)
+        return results
+
+    def rebuild_search_index(self):
+        self._handler.rebuild_search_index()
@@ -0,0 +1,268 @@
+import re
+from typing import Callable, ClassVar, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+
+class RecordError(ValueError):
+    """Raised when a record has an unknown type or misses required fields."""
+
+
+class Record:
+    """
+    Common behaviour of the typed feed records.
+
+    Subclasses are plain __slots__ classes with dataclass-style __init__,
+    __repr__ and __eq__; the dataclasses module itself is not used because
+    importing it (and inspect) dominates the start-up of short CLI runs.
+    """
+
+    __slots__ = ()
+
+    TYPE: ClassVar[str] = ""
+    REQUIRED: ClassVar[Tuple[str, ...]] = ()
+    TEXT_FIELDS: ClassVar[Tuple[str, ...]] = ()
+    KEY_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    def identity(self) -> Tuple[str, ...]:
+        """Fields that identify a record regardless of publish time or event code."""
+        return (self.TYPE,) + tuple(str(getattr(self, name)) for name in self.KEY_FIELDS)
+
+    def validate(self) -> "Record":
+        """Shared validation step: every required field must be present."""
+        for name in self.REQUIRED:
+            if getattr(self, name) is None:
+                raise RecordError(f"{self.TYPE} record is missing '{name}'")
+        return self
+
+    def normalize_text(self, normalizer: Callable[[str], str]) -> "Record":
+        """Apply a text normalizer to the text-like fields in place."""
+        for name in self.TEXT_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                setattr(self, name, normalizer(value))
+        return self
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+
+class News(Record):
+    __slots__ = ("text", "city")
+
+    def __init__(self, text: str | None = None, city: str = "Unknown"):
+        self.text = text
+        self.city = city
+
+    TYPE: ClassVar[str] = "news"
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("text",)
+    TEXT_FIELDS: ClassVar[Tuple[str, ...]] = ("text", "city")
+    KEY_FIELDS: ClassVar[Tuple[str, ...]] = ("text", "city")
+
+
+class PrivateAd(Record):
+    __slots__ = ("text", "expires")
+
+    def __init__(self, text: str | None = None, expires: str | None = None):
+        self.text = text
+        self.expires = expires
+
+    TYPE: ClassVar[str] = "ad"
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("text", "expires")
+    TEXT_FIELDS: ClassVar[Tuple[str, ...]] = ("text",)
+    KEY_FIELDS: ClassVar[Tuple[str, ...]] = ("text", "expires")
+
+
+class Event(Record):
+    __slots__ = ("name", "location", "time")
+
+    def __init__(self, name: str | None = None, location: str | None = None, time: str | None = None):
+        self.name = name
+        self.location = location
+        self.time = time
+
+    TYPE: ClassVar[str] = "event"
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("name", "location", "time")
+    TEXT_FIELDS: ClassVar[Tuple[str, ...]] = ("name", "location")
+    KEY_FIELDS: ClassVar[Tuple[str, ...]] = ("name", "time")
+
+
+RECORD_TYPES: Dict[str, type] = {
+    "news": News,
+    "ad": PrivateAd,
+    "private_ad": PrivateAd,
+    "event": Event,
+}
+
+# Input formats disagree on some key names; map them onto record fields.
+FIELD_ALIASES: Dict[str, str] = {"exp_date": "expires"}
+
+
+def build_record(fields: Mapping[str, object]) -> Record:
+    """Build a typed record from lower-case keyed fields (type, text, city, ...)."""
+    record_type = str(fields.get("type", "")).lower()
+    cls = RECORD_TYPES.get(record_type)
+    if cls is None:
+        raise RecordError(f"Unknown record type: {record_type}")
+    slots = cls.__slots__
+    kwargs = {}
+    for key, value in fields.items():
+        key = FIELD_ALIASES.get(key, key)
+        if key in slots:
+            kwargs[key] = value
+    return cls(**kwargs)
+
+
+# =========================
+# TEXT FORMAT PARSER
+# =========================
+
+# Any run of three or more dashes ends the current block, even mid-line.
+BLOCK_DELIMITER = re.compile(r'-{3,}')
+
+
+def _add_field(fields: Dict[str, str], line: str):
+    line = line.strip()
+    if ":" in line:
+        key, val = line.split(":", 1)
+        fields[key.strip().lower()] = val.strip()
+
+
+def iter_text_fields(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Stream '---'-delimited text records line by line.
+
+    Yields the 'key: value' fields of each block as soon as the block ends,
+    so only the block being read is held in memory. Blocks without any
+    'key: value' line are skipped.
+    """
+    fields: Dict[str, str] = {}
+    for raw_line in lines:
+        for line in raw_line.splitlines():
+            for i, part in enumerate(BLOCK_DELIMITER.split(line)):
+                if i:
+                    if fields:
+                        yield fields
+                    fields = {}
+                _add_field(fields, part)
+    if fields:
+        yield fields
+
+
+# =========================
+# FEED FORMAT READER
+# =========================
+
+# Header lines written by the publish_* functions, e.g. "News -------------------------".
+FEED_HEADER = re.compile(r'^(News|Private Ad|Event) -{3,}$')
+
+
+def _feed_record(kind: str, body: List[str]) -> Record | None:
+    while body and not body[-1].strip():
+        body.pop()
+    if not body:
+        return None
+    if kind == "News":
+        # Last line is "<city>, <YYYY-MM-DD HH:MM>"
+        return News("\n".join(body[:-1]), body[-1].rsplit(", ", 1)[0])
+    if kind == "Private Ad":
+        # Last line is "Expires: <YYYY-MM-DD>, <n> days left"
+        last = body[-1]
+        expires = last[len("Expires: "):].split(",", 1)[0] if last.startswith("Expires: ") else None
+        return PrivateAd("\n".join(body[:-1]), expires)
+    fields = {}
+    for line in body:
+        if ": " in line:
+            key, val = line.split(": ", 1)
+            fields[key] = val
+    return Event(fields.get("Event"), fields.get("Location"), fields.get("Time"))
+
+
+def iter_feed_records(lines: Iterable[str]) -> Iterator[Record]:
+    """Read records back from a published feed (news_feed.txt) line by line."""
+    kind = None
+    body: List[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        match = FEED_HEADER.match(line)
+        if match:
+            if kind:
+                rec = _feed_record(kind, body)
+                if rec is not None:
+                    yield rec
+            kind, body = match.group(1), []
+        elif kind:
+            body.append(line)
+    if kind:
+        rec = _feed_record(kind, body)
+        if rec is not None:
+            yield rec
+
+
+def iter_feed_blocks(lines: Iterable[str]) -> Iterator[Tuple[str | None, List[str]]]:
+    """Raw feed lines grouped per record: (kind, [header line, body lines...]).
+
+    Unlike iter_feed_records nothing is stripped or parsed, so the blocks
+    add up to the feed text exactly; lines before the first header come
+    as a (None, lines) block.
+    """
+    kind = None
+    block: List[str] = []
+    for line in lines:
+        match = FEED_HEADER.match(line.rstrip("\r\n"))
+        if match:
+            if block:
+                yield kind, block
+            kind, block = match.group(1), []
+        block.append(line)
+    if block:
+        yield kind, block
+
+
+# =========================
+# MEMORY BENCHMARK
+# =========================
+
+def _random_words(rng, count: int) -> str:
+    import string
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+                    for _ in range(count))
+
+
+def _measure(builder: Callable[[], List[object]]) -> Tuple[int, List[object]]:
+    import tracemalloc
+    tracemalloc.start()
+    items = builder()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, items
+
+
+def run_memory_benchmark(count: int = 100_000, seed: int = 42):
+    """Compare memory of dict records (old representation) with slotted records."""
+    import random
+    rng = random.Random(seed)
+    # Values are shared by both representations so only the containers are measured.
+    texts = [_random_words(rng, 8) for _ in range(count)]
+    cities = [rng.choice(["London", "Paris", "Berlin", "Kyiv"]) for _ in range(count)]
+
+    dict_size, dicts = _measure(
+        lambda: [{"TYPE": "news", "TEXT": t, "CITY": c} for t, c in zip(texts, cities)])
+    del dicts
+    slot_size, records = _measure(lambda: [News(t, c) for t, c in zip(texts, cities)])
+    del records
+
+    print(f"Records: {count}")
+    print(f"dict records:    {dict_size / 1024 / 1024:8.2f} MiB ({dict_size / count:.0f} B/record)")
+    print(f"slotted records: {slot_size / 1024 / 1024:8.2f} MiB ({slot_size / count:.0f} B/record)")
+    if slot_size:
+        print(f"Ratio: {dict_size / slot_size:.2f}x")
+
+
+if __name__ == "__main__":
+    run_memory_benchmark()
@@ -0,0 +1,243 @@
+"""
+Sorting algorithms for numeric samples, selectable by name.
+
+Every algorithm keeps the contract of the original bubble_sort in
+Hometask.py: the list is sorted in place (min to max) and returned.
+
+    sort_numbers(numbers)                 # picks an algorithm for the data
+    sort_numbers(numbers, "counting")     # or ask for one from ALGORITHMS
+
+Run `python hometask_sorting.py` for a benchmark across sizes and input
+distributions.
+"""
+from bisect import insort
+from collections import Counter
+from typing import Callable, Dict, List
+
+ALGORITHMS: Dict[str, Callable[[List], List]] = {}
+
+# Counting sort is used while the value range is at most this many times
+# the input size (the 0–1000 samples of Hometask.py always qualify).
+COUNTING_RANGE_FACTOR = 4
+MIN_RUN = 32
+
+
+def algorithm(name: str):
+    """Register a sorting function under `name`."""
+    def decorator(func):
+        ALGORITHMS[name] = func
+        return func
+    return decorator
+
+
+@algorithm("bubble")
+def bubble_sort(lst):
+    n = len(lst)
+    # Outer loop runs for each element
+    for i in range(n):
+        # Inner loop compares adjacent elements
+        for j in range(0, n - i - 1):
+            if lst[j] > lst[j + 1]:
+                # Swap if current element is greater than next
+                lst[j], lst[j + 1] = lst[j + 1], lst[j]
+    return lst
+
+
+def _fill_counts(lst: List[int], counts: Counter) -> List[int]:
+    pos = 0
+    for value in range(min(counts), max(counts) + 1):
+        count = counts.get(value)
+        if count:
+            lst[pos:pos + count] = [value] * count
+            pos += count
+    return lst
+
+
+@algorithm("counting")
+def counting_sort(lst: List[int]) -> List[int]:
+    """O(n + k) for integers spanning a range of k values."""
+    if not lst:
+        return lst
+    return _fill_counts(lst, Counter(lst))  # counted in C
+
+
+@algorithm("radix")
+def radix_sort(lst: List[int], bits: int | None = None) -> List[int]:
+    """LSD radix sort on `bits`-bit digits; any integers, including negatives."""
+    if not lst:
+        return lst
+    if bits is None:
+        # About one bucket per item, between 2**8 and 2**16 buckets.
+        bits = min(16, max(8, len(lst).bit_length()))
+    lo = min(lst)
+    span = max(lst) - lo
+    mask = (1 << bits) - 1
+    keys = [x - lo for x in lst]
+    shift = 0
+    while shift == 0 or span >> shift:
+        buckets: List[List[int]] = [[] for _ in range(mask + 1)]
+        for key in keys:
+            buckets[(key >> shift) & mask].append(key)
+        keys = [key for bucket in buckets for key in bucket]
+        shift += bits
+    lst[:] = [key + lo for key in keys]
+    return lst
+
+
+def _runs(lst: List, start: int, end: int) -> List[tuple]:
+    """Split lst[start:end] into ascending runs of at least MIN_RUN items."""
+    runs = []
+    i = start
+    while i < end:
+        j = i + 1
+        if j < end and lst[j] < lst[i]:
+            # Strictly descending run: reverse it in place.
+            while j < end and lst[j] < lst[j - 1]:
+                j += 1
+            lst[i:j] = lst[i:j][::-1]
+        else:
+            while j < end and lst[j] >= lst[j - 1]:
+                j += 1
+        if j - i < MIN_RUN and j < end:
+            # Extend short runs with binary insertion.
+            stop = min(end, i + MIN_RUN)
+            run = lst[i:j]
+            for x in lst[j:stop]:
+                insort(run, x)
+            lst[i:stop] = run
+            j = stop
+        runs.append((i, j))
+        i = j
+    return runs
+
+
+def _merge(lst: List, lo: int, mid: int, hi: int):
+    if lst[mid - 1] <= lst[mid]:
+        return  # already in order, common for nearly sorted input
+    left = lst[lo:mid]
+    i, j, k = 0, mid, lo
+    n_left = len(left)
+    while i < n_left and j < hi:
+        if lst[j] < left[i]:
+            lst[k] = lst[j]
+            j += 1
+        else:
+            lst[k] = left[i]
+            i += 1
+        k += 1
+    if i < n_left:
+        lst[k:hi] = left[i:]
+
+
+@algorithm("merge")
+def merge_sort(lst: List) -> List:
+    """Adaptive (natural) merge sort: O(n) on sorted or reversed input, stable."""
+    runs = _runs(lst, 0, len(lst))
+    while len(runs) > 1:
+        merged = []
+        for r in range(0, len(runs) - 1, 2):
+            (lo, mid), (_, hi) = runs[r], runs[r + 1]
+            _merge(lst, lo, mid, hi)
+            merged.append((lo, hi))
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return lst
+
+
+@algorithm("numpy")
+def numpy_sort(lst):
+    """Sort with NumPy; ndarrays are sorted in place, lists are written back."""
+    import numpy as np
+    if isinstance(lst, np.ndarray):
+        lst.sort(kind="stable")
+        return lst
+    lst[:] = np.sort(np.asarray(lst), kind="stable").tolist()
+    return lst
+
+
+def sort_numbers(lst, algorithm: str = "auto"):
+    """Sort `lst` in place from min to max and return it.
+
+    "auto" uses NumPy for ndarrays, counting sort for integers in a range
+    of at most COUNTING_RANGE_FACTOR * len(lst) values, radix sort for other
+    large integer inputs and merge sort for everything else.
+    """
+    if algorithm == "auto":
+        return _auto_sort(lst)
+    try:
+        func = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown sorting algorithm: {algorithm} (choose from {', '.join(ALGORITHMS)})")
+    return func(lst)
+
+
+def _auto_sort(lst):
+    if type(lst).__module__ == "numpy":
+        return numpy_sort(lst)
+    if len(lst) < 2 * MIN_RUN:
+        return merge_sort(lst)
+    lo, hi = min(lst), max(lst)
+    if type(lo) is int and type(hi) is int:
+        if hi - lo <= COUNTING_RANGE_FACTOR * len(lst):
+            # Counted in C; the few distinct keys are cheap to type-check.
+            counts = Counter(lst)
+            if all(type(value) is int for value in counts):
+                return _fill_counts(lst, counts)
+        elif len(lst) >= 1 << 12 and all(type(value) is int for value in lst):
+            return radix_sort(lst)
+    return merge_sort(lst)
+
+
+# =========================
+# BENCHMARK
+# =========================
+
+def _distributions(size: int, seed: int) -> Dict[str, List[int]]:
+    import random
+    rng = random.Random(seed)
+    bounded = [rng.randint(0, 1000) for _ in range(size)]
+    nearly = sorted(bounded)
+    for _ in range(max(1, size // 100)):
+        a, b = rng.randrange(size), rng.randrange(size)
+        nearly[a], nearly[b] = nearly[b], nearly[a]
+    return {
+        "random_0_1000": bounded,
+        "random_wide": [rng.randint(-2 ** 31, 2 ** 31) for _ in range(size)],
+        "sorted": sorted(bounded),
+        "reversed": sorted(bounded, reverse=True),
+        "nearly_sorted": nearly,
+    }
+
+
+def run_benchmark(sizes: List[int], seed: int = 42, bubble_limit: int = 2000):
+    import time
+    try:
+        import numpy  # noqa: F401
+        names = list(ALGORITHMS)
+    except ImportError:
+        names = [name for name in ALGORITHMS if name != "numpy"]
+    print(f"{'size':>9s} {'distribution':15s} " + " ".join(f"{name:>10s}" for name in names + ["auto"]))
+    for size in sizes:
+        for dist, data in _distributions(size, seed).items():
+            expected = sorted(data)
+            cells = []
+            for name in names + ["auto"]:
+                if name == "bubble" and size > bubble_limit:
+                    cells.append(f"{'-':>10s}")
+                    continue
+                if name == "counting" and max(data) - min(data) > 10 * len(data) + 1000:
+                    cells.append(f"{'-':>10s}")
+                    continue
+                work = list(data)
+                start = time.perf_counter()
+                result = sort_numbers(work, name)
+                elapsed = time.perf_counter() - start
+                assert result is work and work == expected, (name, dist)
+                cells.append(f"{elapsed * 1000:9.1f}ms")
+            print(f"{size:>9d} {dist:15s} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    import sys
+    run_benchmark([int(arg) for arg in sys.argv[1:]] or [1000, 100_000, 1_000_000])
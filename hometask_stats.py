@@ -0,0 +1,131 @@
+import json
+import os
+import re
+import string
+from collections import Counter
+from typing import Dict, List
+
+from hometask_charstats import letter_counts
+from hometask_profile import profiled
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+ASCII_LETTERS = frozenset(string.ascii_letters)
+
+READ_HINT = 1 << 20  # read feeds in ~1 MiB batches of whole lines
+
+
+class FeedStats:
+    """
+    Mergeable word and letter counters of a feed (or one feed segment).
+
+    `words` counts lower-cased \\w+ tokens in first-seen order and `chars`
+    counts every alphabetic character as written. Both CSV flavours in
+    this repo can be derived from them, and counters of several segments
+    can simply be added together.
+    """
+
+    __slots__ = ("words", "chars")
+
+    def __init__(self, words: Dict[str, int] | None = None, chars: Dict[str, int] | None = None):
+        self.words = Counter(words or {})
+        self.chars = Counter(chars or {})
+
+    @classmethod
+    @profiled("stats.count_file")
+    def from_file(cls, file_path: str, opener=open, limit: int | None = None) -> "FeedStats":
+        """Count a feed file in batches of lines instead of one big read.
+
+        With `limit`, only the first `limit` bytes are counted.
+        """
+        stats = cls()
+        if not os.path.exists(file_path):
+            return stats
+        with opener(file_path, "rb") as f:
+            while limit is None or limit > 0:
+                lines = f.readlines(READ_HINT)
+                if not lines:
+                    break
+                data = b"".join(lines)
+                if limit is not None:
+                    data = data[:limit]
+                    limit -= len(data)
+                stats.add_text(data.decode("utf-8"))
+        return stats
+
+    def add_text(self, text: str):
+        self.words.update(WORD_PATTERN.findall(text.lower()))
+        self.chars.update(letter_counts(text))
+
+    def update(self, other: "FeedStats") -> "FeedStats":
+        """Merge another segment's counters into this one."""
+        self.words.update(other.words)
+        self.chars.update(other.chars)
+        return self
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        return {"words": dict(self.words), "chars": dict(self.chars)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, int]]) -> "FeedStats":
+        return cls(data.get("words"), data.get("chars"))
+
+    def save(self, path: str):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FeedStats":
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    # ---------- CSV VIEWS ----------
+
+    def alpha_word_counts(self) -> List[List]:
+        """word_count.csv rows of generate_statistics: ASCII-letter words, sorted."""
+        return [[w, c] for w, c in sorted(self.words.items()) if w.isascii() and w.isalpha()]
+
+    def top_word_rows(self, k: int, alpha_only: bool = False) -> List[List]:
+        """word_top.csv rows: rank, word, count, percentage of the K most frequent words.
+
+        alpha_only restricts both the words and the total to those of alpha_word_counts().
+        """
+        from hometask_topk import ranked_rows, top_k
+        words = self.words
+        if alpha_only:
+            words = {w: c for w, c in words.items() if w.isascii() and w.isalpha()}
+        return ranked_rows(top_k(words, k), sum(words.values()))
+
+    def letter_stat_rows(self) -> List[List]:
+        """letter_stat.csv rows: letter, count_all, count_uppercase, percentage."""
+        total_letters = sum(n for c, n in self.chars.items() if c in ASCII_LETTERS)
+        lower_counts = Counter()
+        for c, n in self.chars.items():
+            for lc in c.lower():
+                lower_counts[lc] += n
+        rows = []
+        for ch in sorted(lower_counts):
+            if not ch.isalpha():
+                continue
+            count_all = lower_counts[ch]
+            count_upper = self.chars.get(ch.upper(), 0)
+            percent = round((count_all / total_letters) * 100, 2) if total_letters else 0
+            rows.append([ch, count_all, count_upper, percent])
+        return rows
+
+    def letter_count_rows(self) -> List[List]:
+        """letter_count.csv rows of update_csvs: letter, count_all, count_uppercase, percentage."""
+        letter_data = {}
+        for c, n in self.chars.items():
+            lower = c.lower()
+            if lower not in letter_data:
+                letter_data[lower] = {"count_all": 0, "count_upper": 0}
+            letter_data[lower]["count_all"] += n
+            if c.isupper():
+                letter_data[lower]["count_upper"] += n
+        total = sum(v["count_all"] for v in letter_data.values())
+        return [[letter, v["count_all"], v["count_upper"], round((v["count_all"] / total) * 100, 2)]
+                for letter, v in sorted(letter_data.items())]
@@ -0,0 +1,183 @@
+"""
+Top-K word counts without sorting (or keeping) every distinct word.
+
+top_k() picks the K most frequent words of an existing counter with a heap
+in O(n log K): this is what the ranked word_top.csv of generate_statistics
+and update_csvs is built from.
+
+For feeds whose vocabulary does not fit in memory, TopKCounter counts a
+word stream in bounded memory: a Count-Min sketch estimates the count
+of every word, the long tail included, and a min-heap keeps the K words
+with the highest estimates. Sketch counts never undercount; with width w
+and depth d they overcount by at most e/w * total words with probability
+1 - e^-d.
+
+    python hometask_topk.py news_feed.txt --k 1000              # exact, from FeedStats
+    python hometask_topk.py news_feed.txt --k 1000 --stream     # bounded memory
+"""
+import hashlib
+import heapq
+import os
+import struct
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+DEFAULT_K = 5000
+
+
+def top_k(counts: Mapping[str, int], k: int) -> List[Tuple[str, int]]:
+    """The `k` most frequent words, by count descending, then alphabetically."""
+    if k <= 0 or not counts:
+        return []
+    threshold = heapq.nlargest(k, counts.values())[-1]
+    above = sorted(((w, c) for w, c in counts.items() if c > threshold), key=lambda wc: (-wc[1], wc[0]))
+    ties = heapq.nsmallest(k - len(above), (w for w, c in counts.items() if c == threshold))
+    return above + [(w, threshold) for w in ties]
+
+
+def ranked_rows(top: Iterable[Tuple[str, int]], total: int) -> List[List]:
+    """word_top.csv rows: rank, word, count, percentage of all counted words."""
+    return [[rank, word, count, round(count / total * 100, 4) if total else 0]
+            for rank, (word, count) in enumerate(top, start=1)]
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency estimates of arbitrarily many strings.
+
+    `depth` rows of `width` counters (rounded up to a power of two); a word
+    increments one counter per row and its estimate is the smallest of
+    them. Conservative updates only raise counters that are below the new
+    estimate, which keeps tail estimates much tighter.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = 1 << max(1, (width - 1).bit_length())
+        self.depth = depth
+        self.total = 0
+        self._mask = self.width - 1
+        self._rows = [array("q", bytes(8 * self.width)) for _ in range(depth)]
+        self._unpack = struct.Struct(f"<{depth}I").unpack
+
+    def _columns(self, word: str) -> Tuple[int, ...]:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4 * self.depth).digest()
+        mask = self._mask
+        return tuple(h & mask for h in self._unpack(digest))
+
+    def add(self, word: str, n: int = 1) -> int:
+        """Count `n` more occurrences of `word` and return its new estimate."""
+        self.total += n
+        columns = self._columns(word)
+        rows = self._rows
+        estimate = min(row[col] for row, col in zip(rows, columns)) + n
+        for row, col in zip(rows, columns):
+            if row[col] < estimate:
+                row[col] = estimate
+        return estimate
+
+    def estimate(self, word: str) -> int:
+        return min(row[col] for row, col in zip(self._rows, self._columns(word)))
+
+    def error_bound(self) -> float:
+        """Overcount that estimates stay below with probability 1 - e^-depth."""
+        return 2.718281828 / self.width * self.total
+
+
+class TopKCounter:
+    """Bounded-memory top-K of a word stream, backed by a Count-Min sketch."""
+
+    def __init__(self, k: int = DEFAULT_K, width: int = 1 << 16, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.counts: Dict[str, int] = {}
+        # Min-heap of (count, word); entries whose count is outdated are skipped lazily.
+        self._heap: List[Tuple[int, str]] = []
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
+
+    def add(self, word: str, n: int = 1):
+        count = self.sketch.add(word, n)
+        if self.k <= 0:
+            return
+        counts = self.counts
+        heap = self._heap
+        if word in counts or len(counts) < self.k:
+            counts[word] = count
+            heapq.heappush(heap, (count, word))
+        else:
+            while counts.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            if count <= heap[0][0]:
+                return
+            _, evicted = heapq.heapreplace(heap, (count, word))
+            del counts[evicted]
+            counts[word] = count
+        if len(heap) > 4 * self.k + 64:
+            self._heap = [(c, w) for w, c in counts.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, words: Mapping[str, int] | Iterable[str]) -> "TopKCounter":
+        """Add a Counter-like mapping of counts, or an iterable of words."""
+        items = words.items() if isinstance(words, Mapping) else Counter(words).items()
+        for word, n in items:
+            self.add(word, n)
+        return self
+
+    def estimate(self, word: str) -> int:
+        count = self.counts.get(word)
+        return count if count is not None else self.sketch.estimate(word)
+
+    def top(self) -> List[Tuple[str, int]]:
+        return top_k(self.counts, self.k)
+
+
+def stream_top_words(feed_path: str, k: int = DEFAULT_K, width: int = 1 << 16, depth: int = 4) -> TopKCounter:
+    """Top-K words of a whole feed (segments and active file), read in batches of lines."""
+    from hometask_feed import SegmentedFeed
+    from hometask_stats import READ_HINT, WORD_PATTERN
+    counter = TopKCounter(k, width, depth)
+    feed = SegmentedFeed(feed_path)
+    for path in feed.all_paths():
+        if not os.path.exists(path):
+            continue
+        with feed.open_text(path) as f:
+            while True:
+                lines = f.readlines(READ_HINT)
+                if not lines:
+                    break
+                counter.update(Counter(WORD_PATTERN.findall("".join(lines).lower())))
+    return counter
+
+
+def main(argv: List[str] | None = None) -> int:
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Write the K most frequent feed words as a ranked CSV.")
+    parser.add_argument("feed", nargs="?", default="news_feed.txt")
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument("--stream", action="store_true", help="bounded memory: Count-Min sketch + heap")
+    parser.add_argument("--width", type=int, default=1 << 16, help="sketch counters per row")
+    parser.add_argument("--depth", type=int, default=4, help="sketch rows")
+    parser.add_argument("-o", "--output", default="word_top.csv")
+    args = parser.parse_args(argv)
+
+    from hometask_publish import publish_csv
+    start = time.perf_counter()
+    if args.stream:
+        counter = stream_top_words(args.feed, args.k, args.width, args.depth)
+        rows = ranked_rows(counter.top(), counter.total)
+        note = f"counts are upper bounds, error <= {counter.sketch.error_bound():.1f} with high probability"
+    else:
+        from hometask_feed import feed_statistics
+        rows = feed_statistics(args.feed).top_word_rows(args.k)
+        note = "exact counts"
+    publish_csv(args.output, ["rank", "word", "count", "percentage"], rows)
+    print(f"{args.output}: {len(rows)} words in {time.perf_counter() - start:.2f}s ({note})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
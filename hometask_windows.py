@@ -0,0 +1,370 @@
+"""
+Time-windowed word and letter statistics of a feed.
+
+Every record is counted into the hour bucket of its own publish time: the
+"<city>, YYYY-MM-DD HH:MM" line of news and the "Time:" line of events.
+Records without one (private ads, damaged records) go to an "undated"
+bucket, so all buckets together add up to the all-time FeedStats.
+
+Buckets live next to the feed, one small JSON file per day:
+
+    news_feed_windows/
+        2030-01-01.json   {"09": {"records": 12, "words": {...}, "chars": {...}}, ...}
+        undated.json      {"--": {...}}
+        state.json        which segments are counted, and how far into the active feed
+
+Each update of a source file is one transaction: the changed day files
+and the new state are staged and then moved in together, so a crash
+never counts records twice or loses them.
+
+update() only reads what was appended (or rotated into a segment) since
+the last call and rewrites only the days it touched. A query for any
+range merges the stored hour buckets and never reads the feed:
+
+    python hometask_windows.py update
+    python hometask_windows.py query --from 2030-01-01 --to 2030-01-02 --by hour --top 5
+    python hometask_windows.py query --from "2030-01-01 12:00" --to "2030-01-01 18:00" --spikes
+"""
+import datetime
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Tuple
+
+from hometask_feedlock import committed_size, feed_lock
+from hometask_records import iter_feed_blocks
+from hometask_stats import READ_HINT, FeedStats
+
+TIMESTAMP = re.compile(r'^(\d{4}-\d{2}-\d{2}) (\d{2}):\d{2}$')
+DAY_FILE = re.compile(r'^(\d{4}-\d{2}-\d{2})\.json$')
+UNDATED = "undated"
+UNDATED_HOUR = "--"
+
+
+def record_hour(kind: str | None, block: List[str]) -> Tuple[str, str] | None:
+    """(day, hour) of a feed record's publish time, e.g. ("2030-01-01", "09")."""
+    stamp = None
+    if kind == "News":
+        # Last line is "<city>, <YYYY-MM-DD HH:MM>"
+        for line in reversed(block[1:]):
+            if line.strip():
+                stamp = line.strip().rsplit(", ", 1)[-1]
+                break
+    elif kind == "Event":
+        for line in block[1:]:
+            if line.startswith("Time: "):
+                stamp = line[len("Time: "):].strip()
+                break
+    match = TIMESTAMP.match(stamp) if stamp else None
+    return (match.group(1), match.group(2)) if match else None
+
+
+def parse_time(value: "str | datetime.datetime") -> datetime.datetime:
+    """Accept datetimes and "YYYY-MM-DD" or "YYYY-MM-DD HH:MM" strings."""
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(value)
+
+
+class WindowBucket:
+    """Record count and word/letter counters of one hour (or a merged range)."""
+
+    __slots__ = ("records", "stats")
+
+    def __init__(self, records: int = 0, stats: FeedStats | None = None):
+        self.records = records
+        self.stats = stats if stats is not None else FeedStats()
+
+    def __repr__(self):
+        return f"WindowBucket(records={self.records}, words={sum(self.stats.words.values())})"
+
+    def update(self, other: "WindowBucket") -> "WindowBucket":
+        self.records += other.records
+        self.stats.update(other.stats)
+        return self
+
+    def to_dict(self) -> Dict:
+        return dict(records=self.records, **self.stats.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WindowBucket":
+        return cls(data.get("records", 0), FeedStats.from_dict(data))
+
+
+def _iter_lines(f, limit: int | None) -> Iterator[str]:
+    """Lines of a binary feed file, read in batches, stopping after `limit` bytes."""
+    while limit is None or limit > 0:
+        lines = f.readlines(READ_HINT)
+        if not lines:
+            break
+        data = b"".join(lines)
+        if limit is not None:
+            data = data[:limit]
+            limit -= len(data)
+        parts = data.decode("utf-8").split("\n")
+        for line in parts[:-1]:
+            yield line + "\n"
+        if parts[-1]:
+            yield parts[-1]
+
+
+class WindowedStats:
+    """Hourly statistics buckets of one feed, updated incrementally."""
+
+    STATE = "state.json"
+    COMMIT = "commit.json"
+    NEXT = ".next"
+    LOCK = ".lock"
+
+    def __init__(self, feed_path: str = "news_feed.txt"):
+        self.feed_path = feed_path
+        self.windows_dir = os.path.splitext(feed_path)[0] + "_windows"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.windows_dir, name)
+
+    # ---------- STORAGE ----------
+
+    def _write_json(self, name: str, data: Dict):
+        path = self._path(name)
+        tmp_path = path + ".tmp"
+        # json.dumps uses the C encoder; json.dump to a file would not.
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False))
+        os.replace(tmp_path, path)
+
+    def _read_json(self, name: str) -> Dict:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_day(self, day: str) -> Dict[str, WindowBucket]:
+        """Hour buckets of one day ("YYYY-MM-DD", or UNDATED)."""
+        return {hour: WindowBucket.from_dict(data) for hour, data in self._read_json(f"{day}.json").items()}
+
+    def _commit(self, counted: Dict[Tuple[str, str], WindowBucket], state: Dict):
+        """Add `counted` to the day files and save `state`, all or nothing.
+
+        Every changed file is first written as <name>.next. commit.json,
+        listing them, is the commit point: before it exists nothing has
+        changed, after it _recover() moves all of them in place, even when
+        a crash interrupted the renames.
+        """
+        days: Dict[str, Dict[str, WindowBucket]] = {}
+        for (day, hour), bucket in counted.items():
+            days.setdefault(day, {})[hour] = bucket
+        names = []
+        for day, hours in days.items():
+            stored = self.load_day(day)
+            for hour, bucket in hours.items():
+                stored.setdefault(hour, WindowBucket()).update(bucket)
+            names.append(f"{day}.json")
+            self._write_json(f"{day}.json{self.NEXT}", {hour: stored[hour].to_dict() for hour in sorted(stored)})
+        names.append(self.STATE)
+        self._write_json(self.STATE + self.NEXT, state)
+        self._write_json(self.COMMIT, {"files": names})
+        self._recover()
+
+    def _recover(self):
+        """Finish a committed update; drop the staged files of an uncommitted one."""
+        commit = self._read_json(self.COMMIT)
+        for name in commit.get("files", []):
+            if os.path.exists(self._path(name + self.NEXT)):
+                os.replace(self._path(name + self.NEXT), self._path(name))
+        if commit:
+            os.remove(self._path(self.COMMIT))
+        for name in os.listdir(self.windows_dir):
+            if name.endswith(self.NEXT):
+                os.remove(self._path(name))
+
+    def clear(self):
+        """Forget every bucket; the next update() recounts the whole feed."""
+        if os.path.isdir(self.windows_dir):
+            for name in os.listdir(self.windows_dir):
+                if name.endswith((".json", self.NEXT)):
+                    os.remove(self._path(name))
+
+    # ---------- UPDATE ----------
+
+    def _count(self, path: str, offset: int, limit: int | None = None) -> Tuple[Dict[Tuple[str, str], WindowBucket], int]:
+        """Hour buckets and record count of `path` from byte `offset` on (`limit` bytes at most)."""
+        counted: Dict[Tuple[str, str], WindowBucket] = {}
+        records = 0
+        pending: List[str] = []
+        pending_key = None
+        pending_chars = 0
+
+        def flush():
+            if pending:
+                counted[pending_key].stats.add_text("".join(pending))
+                pending.clear()
+
+        if path.endswith(".gz"):
+            import gzip
+            f = gzip.open(path, "rb")
+        else:
+            f = open(path, "rb")
+        with f:
+            f.seek(offset)
+            for kind, block in iter_feed_blocks(_iter_lines(f, limit)):
+                key = record_hour(kind, block) or (UNDATED, UNDATED_HOUR)
+                bucket = counted.get(key)
+                if bucket is None:
+                    bucket = counted[key] = WindowBucket()
+                if kind:
+                    bucket.records += 1
+                    records += 1
+                # Consecutive records of the same hour are counted as one text.
+                if key != pending_key or pending_chars > READ_HINT:
+                    flush()
+                    pending_key, pending_chars = key, 0
+                pending.extend(block)
+                pending_chars += sum(len(line) for line in block)
+            flush()
+        return counted, records
+
+    def update(self) -> int:
+        """Count everything appended or rotated since the last update; returns the new records."""
+        from hometask_feed import SegmentedFeed
+        os.makedirs(self.windows_dir, exist_ok=True)
+        lock_path = self._path(self.LOCK)
+        open(lock_path, "a").close()
+        with feed_lock(lock_path):
+            self._recover()
+            state = self._read_json(self.STATE)
+            done = set(state.get("segments", []))
+            active = state.get("active")  # {"inode": ..., "offset": ...} of the active feed
+            try:
+                st = os.stat(self.feed_path)
+                inode, size = st.st_ino, committed_size(self.feed_path)
+            except FileNotFoundError:
+                inode, size = None, 0
+            segments = [seg for seg in SegmentedFeed(self.feed_path).load_manifest()["segments"]
+                        if seg["file"] not in done]
+            if active is not None and (size < active["offset"] if active["inode"] == inode else
+                                       not any(seg.get("inode") == active["inode"] for seg in segments)):
+                # The feed was replaced or truncated rather than rotated: start over.
+                self.clear()
+                active = None
+                done = set()
+                segments = SegmentedFeed(self.feed_path).load_manifest()["segments"]
+
+            records = 0
+            segments_dir = SegmentedFeed(self.feed_path).segments_dir
+            for seg in segments:
+                # The segment that used to be the active feed is counted from where we stopped.
+                offset = active["offset"] if active and seg.get("inode") == active["inode"] else 0
+                counted, count = self._count(os.path.join(segments_dir, seg["file"]), offset)
+                done.add(seg["file"])
+                # Each source is its own transaction: counts and progress are saved together.
+                self._commit(counted, {"segments": sorted(done), "active": None})
+                records += count
+            counted = {}
+            if inode is not None and not any(seg.get("inode") == inode for seg in segments):
+                offset = active["offset"] if active and active["inode"] == inode else 0
+                counted, count = self._count(self.feed_path, offset, size - offset)
+                records += count
+                active = {"inode": inode, "offset": size}
+            else:
+                active = None
+            self._commit(counted, {"segments": sorted(done), "active": active})
+        return records
+
+    # ---------- QUERIES ----------
+
+    def iter_buckets(self, start=None, end=None) -> Iterator[Tuple[datetime.datetime, WindowBucket]]:
+        """Hour buckets with start <= hour < end, oldest first (either bound may be None)."""
+        start = parse_time(start) if start is not None else None
+        end = parse_time(end) if end is not None else None
+        if not os.path.isdir(self.windows_dir):
+            return
+        for name in sorted(os.listdir(self.windows_dir)):
+            match = DAY_FILE.match(name)
+            if not match:
+                continue
+            day = datetime.datetime.fromisoformat(match.group(1))
+            if (start is not None and day + datetime.timedelta(days=1) <= start) or (end is not None and day >= end):
+                continue
+            for hour, bucket in sorted(self.load_day(match.group(1)).items()):
+                when = day.replace(hour=int(hour))
+                if (start is None or when >= start) and (end is None or when < end):
+                    yield when, bucket
+
+    def window(self, start=None, end=None) -> WindowBucket:
+        """Merged statistics of [start, end)."""
+        merged = WindowBucket()
+        for _, bucket in self.iter_buckets(start, end):
+            merged.update(bucket)
+        return merged
+
+    def undated(self) -> WindowBucket:
+        return self.load_day(UNDATED).get(UNDATED_HOUR, WindowBucket())
+
+    def series(self, start=None, end=None, by: str = "day") -> List[Tuple[str, WindowBucket]]:
+        """Per-hour or per-day buckets of [start, end), e.g. [("2030-01-01", bucket), ...]."""
+        fmt = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d"}[by]
+        series: Dict[str, WindowBucket] = {}
+        for when, bucket in self.iter_buckets(start, end):
+            series.setdefault(when.strftime(fmt), WindowBucket()).update(bucket)
+        return list(series.items())
+
+    def spikes(self, start, end, k: int = 20) -> List[Tuple[str, int, float]]:
+        """Words of [start, end) that grew most against the window of the same length before it.
+
+        Returns (word, count, expected) with the earlier count scaled to the
+        current window's word total; ordered by count - expected.
+        """
+        start, end = parse_time(start), parse_time(end)
+        current = self.window(start, end).stats.words
+        before = self.window(start - (end - start), start).stats.words
+        before_total = sum(before.values())
+        scale = sum(current.values()) / before_total if before_total else 0.0
+        growth = [(word, count, round(before.get(word, 0) * scale, 2)) for word, count in current.items()]
+        growth.sort(key=lambda item: (item[2] - item[1], item[0]))
+        return [item for item in growth[:k] if item[1] > item[2]]
+
+
+def update_windows(feed_path: str) -> int:
+    return WindowedStats(feed_path).update()
+
+
+def main(argv: List[str] | None = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Hourly word/letter statistics of a feed.")
+    parser.add_argument("--feed", default="news_feed.txt")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="count records appended since the last update")
+    sub.add_parser("rebuild", help="recount the whole feed")
+    qry = sub.add_parser("query", help="merged statistics of a time range")
+    qry.add_argument("--from", dest="start", metavar="TIME", help="YYYY-MM-DD[ HH:MM], inclusive")
+    qry.add_argument("--to", dest="end", metavar="TIME", help="YYYY-MM-DD[ HH:MM], exclusive")
+    qry.add_argument("--by", choices=["hour", "day"], help="one line per hour or day instead of one total")
+    qry.add_argument("--top", type=int, default=10, help="most frequent words to show")
+    qry.add_argument("--spikes", action="store_true", help="words that grew most against the previous window")
+    args = parser.parse_args(argv)
+
+    windows = WindowedStats(args.feed)
+    if args.command == "rebuild":
+        windows.clear()
+    if args.command in ("update", "rebuild"):
+        print(f"{windows.update()} records counted into {windows.windows_dir}")
+        return 0
+
+    from hometask_topk import top_k
+    if args.spikes:
+        if args.start is None or args.end is None:
+            parser.error("--spikes needs --from and --to")
+        for word, count, expected in windows.spikes(args.start, args.end, args.top):
+            print(f"{word}\t{count}\t(expected {expected})")
+        return 0
+    rows = windows.series(args.start, args.end, args.by) if args.by else [("total", windows.window(args.start, args.end))]
+    for label, bucket in rows:
+        words = ", ".join(f"{w} {c}" for w, c in top_k(bucket.stats.words, args.top))
+        print(f"{label}\t{bucket.records} records\t{words}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
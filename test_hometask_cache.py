@@ -0,0 +1,41 @@
+from hometask_cache import SizedLRUCache
+
+
+def test_entry_bound_evicts_least_recently_used():
+    cache = SizedLRUCache(max_entries=2)
+    cache.put("a", "1", 1)
+    cache.put("b", "2", 1)
+    assert cache.get("a") == "1"  # "b" is now the oldest
+    cache.put("c", "3", 1)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_char_bound_and_oversized_items():
+    cache = SizedLRUCache(max_chars=640)
+    assert cache.max_item_chars == 10
+    cache.put("huge", "x" * 11, 11)
+    assert "huge" not in cache
+    for n in range(100):
+        cache.put(n, "x" * 10, 10)
+    assert len(cache) == 64 and cache.chars == 640
+    cache.put(99, "y", 1)  # replacing an entry releases its old size
+    assert cache.chars == 640 - 10 + 1 and len(cache) == 64
+    cache.resize(max_chars=100)
+    assert cache.chars <= 100 and cache.max_item_chars == 1
+
+
+def test_memoize_returns_copies():
+    cache = SizedLRUCache()
+    calls = []
+
+    @cache.memoize
+    def split(text):
+        calls.append(text)
+        return {"word": text.upper()}
+
+    first = split("abc")
+    first["word"] = "changed"
+    assert split("abc") == {"word": "ABC"}
+    assert calls == ["abc"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+import hometask_core
+from hometask_checkpoint import CheckpointJournal
+
+RECORDS = """type: news
+text: first one
+city: kyiv
+---
+type: ad
+text: no expiry date
+---
+type: news
+text: third one
+city: rome
+"""
+
+
+def _feed() -> str:
+    with open("news_feed.txt", "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _journal() -> dict:
+    with open(CheckpointJournal.DEFAULT_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_invalid_record_is_skipped(feed_dir):
+    with open("r.txt", "w", encoding="utf-8") as f:
+        f.write(RECORDS)
+    hometask_core.FileRecordProcessor("r.txt").process_file()
+    feed = _feed()
+    assert "First one" in feed and "Third one" in feed
+    assert "No expiry date" not in feed
+    assert not os.path.exists("r.txt")
+    assert _journal() == {}
+
+
+def test_resume_past_invalid_record(feed_dir, monkeypatch):
+    with open("r.txt", "w", encoding="utf-8") as f:
+        f.write(RECORDS)
+    publish_record = hometask_core.publish_record
+
+    def fail_on_third(file_path, record, strict=False):
+        if record.text == "Third one":
+            raise OSError("disk full")
+        return publish_record(file_path, record, strict)
+
+    monkeypatch.setattr(hometask_core, "publish_record", fail_on_third)
+    hometask_core.FileRecordProcessor("r.txt").process_file()
+    assert os.path.exists("r.txt")
+    # The invalid ad counts as handled, so the retry starts at the third record.
+    assert _journal()[os.path.abspath("r.txt")]["committed"] == 2
+
+    monkeypatch.setattr(hometask_core, "publish_record", publish_record)
+    hometask_core.FileRecordProcessor("r.txt").process_file()
+    feed = _feed()
+    assert feed.count("First one") == 1 and feed.count("Third one") == 1
+    assert not os.path.exists("r.txt")
+
+
+@pytest.mark.parametrize("line", ["time: tomorrow", ""])
+def test_structured_input_skips_invalid_record(feed_dir, line):
+    import hometask_db
+    with open("r.txt", "w", encoding="utf-8") as f:
+        f.write(f"type: event\nname: expo\nlocation: hall\n{line}\n---\ntype: news\ntext: after it\ncity: oslo\n")
+    hometask_db.DelimitedTextFileInput().process_file("r.txt")
+    feed = _feed()
+    assert "Event ---" not in feed and "After it" in feed
+    assert not os.path.exists("r.txt")
+
+
+def test_journal_resumes_committed_prefix(feed_dir):
+    with open("r.txt", "w", encoding="utf-8") as f:
+        f.write("x")
+    journal = CheckpointJournal(batch_size=2)
+    assert list(journal.resume("r.txt", "abc")) == [(0, "a"), (1, "b"), (2, "c")]
+    journal.commit("r.txt", 1)
+    assert not os.path.exists(CheckpointJournal.DEFAULT_PATH)  # batched
+    journal.commit("r.txt", 2)
+    assert list(CheckpointJournal().resume("r.txt", "abc")) == [(2, "c")]
+
+    with open("r.txt", "w", encoding="utf-8") as f:
+        f.write("changed")
+    assert list(CheckpointJournal().resume("r.txt", "abc"))[0] == (0, "a")
+
+
+def test_journal_flushes_merge(feed_dir):
+    for name in ("a", "b"):
+        with open(name, "w", encoding="utf-8") as f:
+            f.write(name)
+    first, second = CheckpointJournal(batch_size=1), CheckpointJournal(batch_size=1)
+    first.start("a")
+    second.start("b")
+    first.commit("a", 3)
+    second.commit("b", 5)
+    first.complete("a")
+    assert _journal() == {os.path.abspath("b"): {"fingerprint": CheckpointJournal._fingerprint("b"),
+                                                 "committed": 5}}
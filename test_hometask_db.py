@@ -0,0 +1,43 @@
+import contextlib
+import io
+import sqlite3
+
+from hometask_db import DatabaseHandler
+
+
+def _count(table: str) -> int:
+    with contextlib.closing(sqlite3.connect("news_feed.db")) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_write_behind_flush_commits_queued_rows(feed_dir):
+    db = DatabaseHandler(write_behind=True, batch_size=7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for n in range(50):
+            db.insert_news(f"Story {n}.", "Kyiv", "2030-01-01 09:00")
+        db.insert_news("Story 0.", "Kyiv", "2030-01-01 09:00")  # duplicate of a queued row
+        db.flush()
+    assert _count("news") == 50
+    db.close()
+
+
+def test_write_behind_close_drains_queue(feed_dir):
+    db = DatabaseHandler(write_behind=True, queue_size=5, batch_size=3)
+    for n in range(20):
+        db.insert_event(f"Expo {n}", "Hall", "2030-01-01 10:00", f"code{n:04d}")
+    db.close()
+    assert _count("events") == 20
+    # After close() inserts are committed synchronously.
+    db.insert_private_ad("Bike for sale.", "2030-01-01", 10)
+    assert _count("private_ads") == 1
+
+
+def test_write_behind_batch_falls_back_to_single_rows(feed_dir, monkeypatch):
+    db = DatabaseHandler(write_behind=True)
+    monkeypatch.setitem(DatabaseHandler.STATEMENTS, "bad", ("news", "text=?", "INSERT INTO missing VALUES (?)"))
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        db._submit("news", ("Kept.", "Kyiv"), ("Kept.", "Kyiv", "2030-01-01 09:00"))
+        db._submit("bad", ("Lost.",), ("Lost.",))
+        db.close()
+    assert _count("news") == 1
+    assert "DB write failed for bad record" in out.getvalue()
@@ -0,0 +1,74 @@
+import contextlib
+import io
+import multiprocessing
+import os
+
+import hometask_core
+from hometask_dedup import DedupIndex, close_dedup_indexes
+from hometask_feed import SegmentedFeed
+from hometask_records import iter_feed_records
+
+TEXTS = [f"Story number {n}." for n in range(300)]
+
+
+def _load_index() -> DedupIndex:
+    index = DedupIndex("news_feed.txt")
+    index.refresh()
+    return index
+
+
+def test_index_persists_in_sidecar(feed_dir):
+    assert hometask_core.publish_news("news_feed.txt", "Same text.", "Kyiv") is not None
+    close_dedup_indexes()
+    assert os.path.getsize("news_feed.txt.dedup") == 8
+    assert hometask_core.publish_news("news_feed.txt", "same   TEXT.", "kyiv") is None
+    assert hometask_core.publish_news("news_feed.txt", "Other text.", "Kyiv") is not None
+
+
+def test_missing_sidecar_is_rebuilt_from_feed(feed_dir):
+    hometask_core.publish_news("news_feed.txt", "Same text.", "Kyiv")
+    close_dedup_indexes()
+    os.remove("news_feed.txt.dedup")
+    assert len(_load_index()) == 1
+    assert hometask_core.publish_news("news_feed.txt", "Same text.", "Kyiv") is None
+
+
+def test_deleted_feed_keeps_segment_records(feed_dir):
+    hometask_core.publish_news("news_feed.txt", "Rotated away.", "Kyiv")
+    with contextlib.redirect_stdout(io.StringIO()):
+        SegmentedFeed("news_feed.txt").rotate()
+    close_dedup_indexes()
+    os.remove("news_feed.txt")
+    assert hometask_core.publish_news("news_feed.txt", "Rotated away.", "Kyiv") is None
+    assert hometask_core.publish_news("news_feed.txt", "Brand new.", "Kyiv") is not None
+
+
+def test_new_feed_discards_stale_sidecar(feed_dir):
+    hometask_core.publish_news("news_feed.txt", "Old text.", "Kyiv")
+    close_dedup_indexes()
+    os.remove("news_feed.txt")
+    assert hometask_core.publish_news("news_feed.txt", "Old text.", "Kyiv") is not None
+
+
+def _publish_all(directory, start, step):
+    os.chdir(directory)
+    start.wait()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in TEXTS[::step]:
+            hometask_core.publish_news("news_feed.txt", text, "Kyiv")
+    close_dedup_indexes()
+
+
+def test_concurrent_workers_publish_each_record_once(feed_dir):
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(4)
+    workers = [context.Process(target=_publish_all, args=(str(feed_dir), start, step))
+               for step in (1, -1, 1, -1)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+    with open("news_feed.txt", "r", encoding="utf-8") as f:
+        assert sorted(rec.text for rec in iter_feed_records(f)) == sorted(TEXTS)
+    assert len(_load_index()) == len(TEXTS)
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+import hometask_cli
+import hometask_core
+from hometask_feed import SegmentedFeed, feed_statistics
+
+
+def _publish(*texts: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in texts:
+            hometask_core.publish_news("news_feed.txt", text, "Kyiv")
+
+
+def test_statistics_do_not_rotate_by_default(feed_dir):
+    _publish("Big match today.")
+    stats = feed_statistics("news_feed.txt")
+    assert stats.words["match"] == 1
+    assert not os.path.exists("news_feed_segments")
+
+
+def test_cli_rotation_limits(feed_dir):
+    _publish("Big match today.", "Another match.")
+    assert hometask_cli.main(["-q", "--rotate-mb", "0.000001", "--compress-segments", "stats"]) == 0
+    feed = SegmentedFeed("news_feed.txt")
+    assert feed.segment_paths() == [os.path.join("news_feed_segments", "00001.txt.gz")]
+    assert os.path.getsize("news_feed.txt") == 0
+    assert feed.statistics(rotate=False).words["match"] == 2
+
+
+def _rotate(feed: SegmentedFeed) -> str | None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return feed.rotate()
+
+
+def test_rotation_keeps_whole_feed_statistics(feed_dir):
+    feed = SegmentedFeed("news_feed.txt", compress=True)
+    _publish("Big match today.")
+    assert _rotate(feed) == os.path.join("news_feed_segments", "00001.txt.gz")
+    _publish("Another match.")
+    _rotate(feed)
+    _publish("Match again.")
+    assert [seg["id"] for seg in feed.load_manifest()["segments"]] == [1, 2]
+    assert feed.statistics(rotate=False).words["match"] == 3
+    os.remove(os.path.join("news_feed_segments", SegmentedFeed.TOTALS))
+    assert feed.statistics(rotate=False).words["match"] == 3
+
+
+def test_crashed_rotation_is_finished(feed_dir, monkeypatch):
+    feed = SegmentedFeed("news_feed.txt")
+    _publish("Big match today.")
+
+    def crash(seg):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(feed, "_finish_segment", crash)
+        with pytest.raises(KeyboardInterrupt):
+            feed.rotate()
+    assert feed._read_manifest()["segments"][0]["pending"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        manifest = feed.load_manifest()
+    assert "pending" not in manifest["segments"][0]
+    _publish("Another match.")
+    assert feed.statistics(rotate=False).words["match"] == 2
+
+
+def test_pending_entry_of_unmoved_feed_is_dropped(feed_dir, monkeypatch):
+    feed = SegmentedFeed("news_feed.txt")
+    _publish("Big match today.")
+    replace = os.replace
+
+    def crash_on_feed(src, dst):
+        if src == feed.feed_path:
+            raise KeyboardInterrupt  # the pending entry is saved, the feed never moves
+        replace(src, dst)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", crash_on_feed)
+        with pytest.raises(KeyboardInterrupt):
+            feed.rotate()
+    assert feed._read_manifest()["segments"][0]["pending"]
+    assert feed.load_manifest()["segments"] == []
+    assert _rotate(feed) == os.path.join("news_feed_segments", "00001.txt")
+    assert feed.statistics(rotate=False).words["match"] == 1
@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import random
+import time
+import zlib
+from typing import Dict
+
+from hometask_feedlock import append_record, close_feed_writers, committed_size
+
+MAX_SIZE = 16 * 1024
+
+
+def _stress_record(worker: int, seq: int, size: int) -> str:
+    body = "\n".join(f"w{worker} s{seq} " + "x" * 60 for _ in range(max(1, size // 70)))
+    return f"Stress ----------------------\n{worker} {seq} {zlib.crc32(body.encode())}\n{body}\n\n"
+
+
+def _stress_worker(directory: str, worker: int, records: int):
+    os.chdir(directory)
+    rng = random.Random(worker)
+    for seq in range(records):
+        append_record("stress_feed.txt", _stress_record(worker, seq, rng.randint(100, MAX_SIZE)))
+    close_feed_writers()
+
+
+def _check_records(data: str) -> Dict[str, int]:
+    """Count intact and broken stress records in a feed prefix."""
+    intact = broken = 0
+    for block in data.split("\n\n"):
+        if not block:
+            continue
+        lines = block.split("\n")
+        try:
+            _, _, crc = lines[1].split()
+            ok = lines[0].startswith("Stress ---") and zlib.crc32("\n".join(lines[2:]).encode()) == int(crc)
+        except (IndexError, ValueError):
+            ok = False
+        intact += ok
+        broken += not ok
+    return {"intact": intact, "broken": broken}
+
+
+def test_concurrent_appends_stay_whole(feed_dir):
+    processes, records = 4, 150
+    open("stress_feed.txt", "a").close()
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_stress_worker, args=(str(feed_dir), w, records))
+               for w in range(processes)]
+    for worker in workers:
+        worker.start()
+    checks = torn_prefixes = 0
+    while any(worker.is_alive() for worker in workers):
+        # A committed prefix must end with a complete, intact record.
+        size = committed_size("stress_feed.txt")
+        with open("stress_feed.txt", "rb") as f:
+            f.seek(max(0, size - 2 * MAX_SIZE - 200))
+            tail = f.read(size - f.tell()).decode("utf-8", "replace")
+        if tail:
+            last = tail[:-2].rsplit("\n\n", 1)[-1] + "\n\n"
+            checks += 1
+            torn_prefixes += not tail.endswith("\n\n") or _check_records(last)["broken"] > 0
+        time.sleep(0.005)
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+    with open("stress_feed.txt", "r", encoding="utf-8") as f:
+        assert _check_records(f.read()) == {"intact": processes * records, "broken": 0}
+    assert checks and not torn_prefixes
@@ -0,0 +1,35 @@
+import contextlib
+import datetime
+import sqlite3
+
+from hometask_db import DatabaseHandler
+from hometask_maintenance import AdMaintenance
+
+NOW = datetime.datetime(2030, 1, 10, 12, 0)
+
+
+def _rows(sql: str) -> list:
+    with contextlib.closing(sqlite3.connect("news_feed.db")) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_maintenance_archives_and_refreshes(feed_dir):
+    db = DatabaseHandler()
+    for text, exp_date in [("Old.", "2030-01-05"), ("Today.", "2030-01-10"), ("Tomorrow.", "2030-01-11"),
+                           ("Later.", "2030-01-20"), ("Malformed.", "soon")]:
+        db.insert_private_ad(text, exp_date, 0)
+    maintenance = AdMaintenance(batch_size=1)
+    assert maintenance.run(NOW) == {"archived": 2, "updated": 1}
+    assert _rows("SELECT text, days_left FROM private_ads_archive ORDER BY id") == [("Old.", 0), ("Today.", 0)]
+    assert _rows("SELECT text, days_left FROM private_ads ORDER BY id") == [
+        ("Tomorrow.", 0), ("Later.", 9), ("Malformed.", 0)]
+
+    # Later runs that day only look at ads inserted since.
+    assert maintenance.run(NOW) == {"archived": 0, "updated": 0}
+    db.insert_private_ad("New.", "2030-01-15", 99)
+    assert maintenance.run(NOW + datetime.timedelta(hours=1)) == {"archived": 0, "updated": 1}
+    assert _rows("SELECT days_left FROM private_ads WHERE text = 'New.'") == [(4,)]
+
+    assert maintenance.run(NOW + datetime.timedelta(days=2), purge=True) == {"purged": 1, "updated": 2}
+    assert len(_rows("SELECT * FROM private_ads_archive")) == 2
+    maintenance.close()
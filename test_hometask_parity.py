@@ -0,0 +1,201 @@
+"""
+Parity of the news feed front ends built on hometask_core.
+
+Every front end ingests the same records. With the clock and the event
+codes fixed, news_feed.txt and every statistics CSV must come out
+byte-identical. The front ends normalize text in one of two ways:
+modulesfiles, csvparsing and json apply process_text to every text field,
+while xml and db append the last-words sentence of process_text_summary
+to news and ad texts. Feeds are therefore compared within each of these
+two families, and each family is checked against a reference published
+straight through hometask_core.
+
+    python -m pytest -q test_hometask_parity.py
+"""
+import datetime
+import itertools
+import os
+import types
+
+import pytest
+
+import hometask_core
+from hometask_datagen import write_input_file
+from hometask_dedup import close_dedup_indexes
+from hometask_feedlock import close_feed_writers
+from hometask_records import News, PrivateAd, build_record
+
+NOW = datetime.datetime(2030, 1, 1, 9, 30)
+
+RECORDS = [
+    {"type": "news", "text": "big match today. iz it over? the crowd iz loud!", "city": "london"},
+    {"type": "ad", "text": "bike for sale. almost new", "expires": "2030-02-15"},
+    {"type": "event", "name": "tech expo", "location": "hall a", "time": "2030-03-01 10:00"},
+    {"type": "news", "text": "Café ÆON opens in Straße 5. queues iz long", "city": "berlin"},
+    {"type": "news", "text": "big match today. iz it over? the crowd iz loud!", "city": "london"},
+    {"type": "event", "name": "jazz night", "location": "old town", "time": "2030-03-02 20:30"},
+    {"type": "ad", "text": "flat to rent", "expires": "2030-01-20"},
+    {"type": "event", "name": "tech expo", "location": "hall a", "time": "2030-03-01 10:00"},
+]
+
+# (flavour, CSV) pairs: generate_statistics and update_csvs both write word_count.csv.
+STATISTICS = {
+    "generate_statistics": ("word_count.csv", "letter_stat.csv", "word_top.csv"),
+    "update_csvs": ("word_count.csv", "letter_count.csv", "word_top.csv"),
+}
+
+
+class _FixedDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Fresh working directory with a fixed clock; event codes are made sequential per run."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(hometask_core, "datetime", types.SimpleNamespace(datetime=_FixedDatetime))
+    monkeypatch.setattr(hometask_core, "next_event_code", None)  # set per run by _outputs
+    hometask_core.TEXT_CACHE.clear()
+    return tmp_path
+
+
+# ---------- FRONT ENDS ----------
+
+def run_modulesfiles():
+    import hometask_modulesfiles
+    write_input_file("records.txt", RECORDS, "text")
+    hometask_modulesfiles.FileRecordProcessor("records.txt").process_file()
+
+
+def run_csvparsing():
+    import hometask_csvparsing
+    write_input_file("records.txt", RECORDS, "text")
+    hometask_csvparsing.FileRecordProcessor("records.txt").process_file()
+
+
+def run_json_text():
+    import hometask_json
+    write_input_file("records.txt", RECORDS, "text")
+    hometask_json.FileRecordProcessor("records.txt").process_file()
+
+
+def run_json_json():
+    import hometask_json
+    write_input_file("records.json", RECORDS, "json")
+    hometask_json.JsonRecordProcessor("records.json").process_file()
+
+
+def run_xml_json():
+    import hometask_xml
+    write_input_file("records.json", RECORDS, "json")
+    hometask_xml.JSONFileInput().process_file("records.json")
+    hometask_xml.update_csvs("news_feed.txt")
+
+
+def run_xml_xml():
+    import hometask_xml
+    write_input_file("records.xml", RECORDS, "xml")
+    hometask_xml.XMLFileInput().process_file("records.xml")
+    hometask_xml.update_csvs("news_feed.txt")
+
+
+def run_db_json():
+    import hometask_db
+    write_input_file("records.json", RECORDS, "json")
+    hometask_db.JSONFileInput().process_file("records.json")
+    hometask_db.update_csvs("news_feed.txt")
+
+
+def run_db_xml():
+    import hometask_db
+    write_input_file("records.xml", RECORDS, "xml")
+    hometask_db.XMLFileInput().process_file("records.xml")
+    hometask_db.update_csvs("news_feed.txt")
+
+
+def reference_text_family():
+    for fields in RECORDS:
+        rec = build_record(fields).normalize_text(hometask_core.process_text)
+        hometask_core.publish_record("news_feed.txt", rec)
+
+
+def reference_summary_family():
+    for fields in RECORDS:
+        rec = build_record(fields)
+        if isinstance(rec, (News, PrivateAd)):
+            rec.text = hometask_core.process_text_summary(rec.text)["final_text"]
+        hometask_core.publish_record("news_feed.txt", rec, strict=True)
+
+
+FAMILIES = {
+    "process_text": [reference_text_family, run_modulesfiles, run_csvparsing, run_json_text, run_json_json],
+    "process_text_summary": [reference_summary_family, run_xml_json, run_xml_xml, run_db_json, run_db_xml],
+}
+
+
+def _outputs(run, directory) -> dict:
+    """Feed and statistics CSV bytes after `run` ingested RECORDS in `directory`."""
+    os.makedirs(directory)
+    os.chdir(directory)
+    codes = (f"{n:08x}" for n in itertools.count(1))
+    hometask_core.next_event_code = lambda: next(codes)
+    try:
+        run()
+        outputs = {}
+        with open("news_feed.txt", "rb") as f:
+            outputs["news_feed.txt"] = f.read()
+        for flavour, names in STATISTICS.items():
+            getattr(hometask_core, flavour)("news_feed.txt")
+            for name in names:
+                with open(name, "rb") as f:
+                    outputs[f"{flavour}:{name}"] = f.read()
+        return outputs
+    finally:
+        import hometask_db
+        hometask_db.close_db_handler()
+        close_dedup_indexes()
+        close_feed_writers()
+        hometask_core.TEXT_CACHE.clear()
+
+
+@pytest.mark.parametrize("family", sorted(FAMILIES))
+def test_front_ends_are_byte_identical(workdir, family):
+    reference, *front_ends = FAMILIES[family]
+    expected = _outputs(reference, workdir / reference.__name__)
+    for run in front_ends:
+        outputs = _outputs(run, workdir / run.__name__)
+        assert outputs.keys() == expected.keys()
+        for name in expected:
+            assert outputs[name] == expected[name], f"{run.__name__}: {name} differs from {reference.__name__}"
+
+
+def test_reference_feed_content(workdir):
+    """Duplicates are dropped and records carry the fixed date and event codes."""
+    expected = _outputs(reference_text_family, workdir / "feed")
+    feed = expected["news_feed.txt"].decode("utf-8")
+    assert feed.count("News ---") == 2 and feed.count("Private Ad ---") == 2 and feed.count("Event ---") == 2
+    assert "London, 2030-01-01 09:30" in feed
+    assert "Big match today. is it over? The crowd is loud!" in feed
+    assert "Expires: 2030-02-15, 44 days left" in feed
+    assert "Event Code: 00000001" in feed and "Event Code: 00000002" in feed
+
+
+def test_structured_input_requires_iter_fields(workdir):
+    class NoFields(hometask_core._StructuredFileInput):
+        FORMAT = "None"
+
+    with pytest.raises(TypeError):
+        NoFields()
+
+
+def test_db_front_end_stores_published_records(workdir):
+    import hometask_db
+    expected = _outputs(run_db_json, workdir / "db")
+    handler = hometask_db.DatabaseHandler(str(workdir / "db" / "news_feed.db"))
+    stored = {table: handler.fetch_rows(table, -1) for table in handler.TABLES}
+    feed = expected["news_feed.txt"].decode("utf-8")
+    assert len(stored["news"]) == feed.count("News ---") == 2
+    assert len(stored["private_ads"]) == feed.count("Private Ad ---") == 2
+    assert [row["event_code"] for row in stored["events"]] == ["00000002", "00000001"]
@@ -0,0 +1,88 @@
+import datetime
+
+from hometask_db import DatabaseHandler
+from hometask_queries import FeedQueries
+
+
+def _pages(fetch):
+    """All pages of a paginated query, following next_cursor."""
+    pages, after = [], None
+    while True:
+        page = fetch(after)
+        pages.append(page.rows)
+        if page.next_cursor is None:
+            return pages
+        after = page.next_cursor
+
+
+def test_recent_news_pages(feed_dir):
+    db = DatabaseHandler()
+    for n in range(7):
+        db.insert_news(f"Story {n}.", "Kyiv" if n % 2 == 0 else "Rome", "2030-01-01 09:00")
+    with FeedQueries(page_size=2) as queries:
+        pages = _pages(lambda after: queries.recent_news("Kyiv", after))
+        assert [[row["text"] for row in page] for page in pages] == [
+            ["Story 6.", "Story 4."], ["Story 2.", "Story 0."]]
+        assert list(queries.iter_recent_news("Kyiv")) == [row for page in pages for row in page]
+
+
+def test_expiring_ads_pages_through_equal_dates(feed_dir):
+    db = DatabaseHandler()
+    today = datetime.date(2030, 1, 1)
+    # Several ads share an exp_date, so the cursor must break ties by id.
+    dates = ["2030-01-03", "2030-01-02", "2030-01-03", "2029-12-31", "2030-01-02", "2030-01-03", "2030-02-01"]
+    for n, exp_date in enumerate(dates):
+        db.insert_private_ad(f"Ad {n}.", exp_date, 0)
+    with FeedQueries(fetch_size=2) as queries:
+        pages = _pages(lambda after: queries.ads_expiring_within(7, after, limit=2, today=today))
+        rows = [row for page in pages for row in page]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [(row["exp_date"], row["text"]) for row in rows] == [
+            ("2030-01-02", "Ad 1."), ("2030-01-02", "Ad 4."),
+            ("2030-01-03", "Ad 0."), ("2030-01-03", "Ad 2."), ("2030-01-03", "Ad 5.")]
+        assert list(queries.iter_ads_expiring_within(7, today=today)) == rows
+
+
+def test_events_between_pages(feed_dir):
+    db = DatabaseHandler()
+    times = ["2030-03-01 10:00", "2030-02-28 23:00", "2030-03-01 10:00", "2030-03-31 09:00", "2030-04-01 00:00"]
+    for n, time_str in enumerate(times):
+        db.insert_event(f"Expo {n}", "Hall", time_str, f"code{n:04d}")
+    with FeedQueries() as queries:
+        pages = _pages(lambda after: queries.events_between("2030-03-01", "2030-04-01", after, limit=1))
+        assert [page[0]["name"] for page in pages] == ["Expo 0", "Expo 2", "Expo 3"]
+
+
+def _fill_search_db() -> DatabaseHandler:
+    db = DatabaseHandler()
+    db.insert_news("Big match today.", "London", "2030-01-01 09:00")
+    db.insert_news("Match report.", "Paris", "2030-01-01 09:00")
+    db.insert_private_ad("Bike for sale, London area.", "2030-01-01", 10)
+    db.insert_event("London match", "Stadium", "2030-01-01 10:00", "code0001")
+    return db
+
+
+def test_search_matches_all_words(feed_dir):
+    _fill_search_db()
+    with FeedQueries() as queries:
+        assert queries.has_fts
+        found = queries.search("london match")
+        assert sorted((row["kind"], row["id"]) for row in found) == [("events", 1), ("news", 1)]
+        assert [row["rank"] for row in found] == sorted(row["rank"] for row in found)
+        # Plain queries quote FTS5 operators; raw ones pass them through.
+        assert queries.search("match OR bike") == []
+        assert len(queries.search("match OR bike", raw=True)) == 4
+        assert {(row["kind"], row["id"]) for row in queries.search_like("london match")} == {
+            ("events", 1), ("news", 1)}
+
+
+def test_search_index_follows_updates_and_deletes(feed_dir):
+    _fill_search_db()
+    with FeedQueries() as queries:
+        with queries._conn:
+            queries._conn.execute("UPDATE news SET text = 'Quiet day.' WHERE id = 1")
+            queries._conn.execute("DELETE FROM events WHERE id = 1")
+        assert queries.search("london match") == []
+        assert [row["text"] for row in queries.search("quiet")] == ["Quiet day."]
+        queries.rebuild_search_index()
+        assert [row["text"] for row in queries.search("quiet")] == ["Quiet day."]
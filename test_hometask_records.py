@@ -0,0 +1,49 @@
+import contextlib
+import io
+
+import pytest
+
+import hometask_core
+from hometask_records import (
+    Event,
+    News,
+    PrivateAd,
+    RecordError,
+    build_record,
+    iter_feed_blocks,
+    iter_feed_records,
+    iter_text_fields,
+)
+
+
+def test_build_record_and_validate():
+    assert build_record({"type": "NEWS", "text": "Hi", "extra": 1}) == News("Hi", "Unknown")
+    assert build_record({"type": "private_ad", "text": "Bike", "exp_date": "2030-01-01"}) == PrivateAd(
+        "Bike", "2030-01-01")
+    with pytest.raises(RecordError, match="Unknown record type: poem"):
+        build_record({"type": "poem"})
+    with pytest.raises(RecordError, match="event record is missing 'time'"):
+        build_record({"type": "event", "name": "Expo", "location": "Hall"}).validate()
+    assert Event("Expo", "Hall", "2030-01-01 10:00").identity() == ("event", "Expo", "2030-01-01 10:00")
+    assert News("big  news", "kyiv").normalize_text(str.upper) == News("BIG  NEWS", "KYIV")
+
+
+def test_text_fields_split_on_any_dash_run():
+    lines = ["type: news\n", "text: a\n", "---type: ad\n", "no field here\n", "-----\n", "----\n", "type: event"]
+    assert list(iter_text_fields(lines)) == [
+        {"type": "news", "text": "a"}, {"type": "ad"}, {"type": "event"}]
+
+
+def test_feed_reads_back_published_records(feed_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        hometask_core.publish_news("news_feed.txt", "Big match.", "London")
+        hometask_core.publish_private_ad("news_feed.txt", "Bike for sale.", "2030-01-01")
+        hometask_core.publish_event("news_feed.txt", "Expo", "Hall", "2030-01-01 10:00")
+    with open("news_feed.txt", "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    assert list(iter_feed_records(lines)) == [
+        News("Big match.", "London"), PrivateAd("Bike for sale.", "2030-01-01"),
+        Event("Expo", "Hall", "2030-01-01 10:00")]
+    blocks = list(iter_feed_blocks(["stray\n"] + lines))
+    assert [kind for kind, _ in blocks] == [None, "News", "Private Ad", "Event"]
+    assert "".join(line for _, block in blocks for line in block) == "".join(["stray\n"] + lines)
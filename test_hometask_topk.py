@@ -0,0 +1,50 @@
+import contextlib
+import io
+import random
+from collections import Counter
+
+import hometask_core
+from hometask_feed import feed_statistics
+from hometask_topk import CountMinSketch, TopKCounter, ranked_rows, stream_top_words, top_k
+
+
+def _zipf_words(count: int, vocabulary: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = [f"w{n}" for n in range(vocabulary)]
+    return rng.choices(words, weights=[1 / (n + 1) for n in range(vocabulary)], k=count)
+
+
+def test_top_k_matches_full_sort():
+    counts = Counter(_zipf_words(5000, 300))
+    expected = sorted(counts.items(), key=lambda wc: (-wc[1], wc[0]))
+    for k in (1, 10, 150, 300, 1000):
+        assert top_k(counts, k) == expected[:k]
+    assert top_k(counts, 0) == [] and top_k({}, 5) == []
+    assert top_k({"b": 2, "c": 2, "a": 2, "d": 3}, 3) == [("d", 3), ("a", 2), ("b", 2)]
+
+
+def test_sketch_never_undercounts():
+    words = _zipf_words(20_000, 2000)
+    sketch = CountMinSketch(width=256, depth=4)
+    for word in words:
+        sketch.add(word)
+    bound = sketch.error_bound()
+    for word, count in Counter(words).items():
+        assert count <= sketch.estimate(word) <= count + bound
+
+
+def test_stream_top_k_finds_heavy_hitters():
+    words = _zipf_words(50_000, 5000)
+    exact = top_k(Counter(words), 20)
+    counter = TopKCounter(k=20, width=1 << 12).update(words)
+    assert [word for word, _ in counter.top()[:10]] == [word for word, _ in exact[:10]]
+    # A sketch wider than the vocabulary counts exactly.
+    assert TopKCounter(k=20, width=1 << 20).update(words).top() == exact
+
+
+def test_stream_matches_exact_feed_counts(feed_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for n, word in enumerate(_zipf_words(300, 40)):
+            hometask_core.publish_news("news_feed.txt", f"{word} story {n}.", "Kyiv")
+    counter = stream_top_words("news_feed.txt", k=10)
+    assert ranked_rows(counter.top(), counter.total) == feed_statistics("news_feed.txt").top_word_rows(10)
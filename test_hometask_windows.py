@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+import hometask_core
+from hometask_feed import SegmentedFeed
+from hometask_stats import FeedStats
+from hometask_windows import WindowedStats
+
+
+def _publish_events(*times: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for time_str in times:
+            hometask_core.publish_event("news_feed.txt", f"Expo {time_str}", "Hall", time_str)
+        hometask_core.publish_private_ad("news_feed.txt", f"Bike for sale, {times[0]}.", "2030-01-01")
+
+
+def _assert_counted_once(windows: WindowedStats):
+    """All buckets together add up to the statistics of the whole feed."""
+    total = windows.window().update(windows.undated())
+    feed = SegmentedFeed("news_feed.txt")
+    expected = FeedStats()
+    for path in feed.all_paths():
+        with feed.open_text(path) as f:
+            expected.add_text(f.read())
+    assert total.stats.to_dict() == expected.to_dict()
+
+
+def test_update_counts_appends_and_rotations_once(feed_dir):
+    windows = WindowedStats()
+    _publish_events("2030-01-01 09:15", "2030-01-01 09:45", "2030-01-01 14:00")
+    assert windows.update() == 4
+    assert windows.update() == 0
+    assert [(when.hour, bucket.records) for when, bucket in windows.iter_buckets("2030-01-01", "2030-01-02")] == [
+        (9, 2), (14, 1)]
+    assert windows.undated().records == 1
+
+    _publish_events("2030-01-02 08:00")
+    with contextlib.redirect_stdout(io.StringIO()):
+        SegmentedFeed("news_feed.txt", compress=True).rotate()
+    _publish_events("2030-01-02 09:00")
+    assert windows.update() == 4
+    assert [(label, bucket.records) for label, bucket in windows.series(by="day")] == [
+        ("2030-01-01", 3), ("2030-01-02", 2)]
+    _assert_counted_once(windows)
+
+
+def test_crash_before_commit_point_changes_nothing(feed_dir, monkeypatch):
+    windows = WindowedStats()
+    _publish_events("2030-01-01 09:15")
+    windows.update()
+    _publish_events("2030-01-01 10:00", "2030-01-03 10:00")
+    write_json = windows._write_json
+
+    def crash_on_commit(name, data):
+        if name == WindowedStats.COMMIT:
+            raise KeyboardInterrupt
+        write_json(name, data)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(windows, "_write_json", crash_on_commit)
+        with pytest.raises(KeyboardInterrupt):
+            windows.update()
+    assert windows.window().records == 1
+    assert windows.update() == 3
+    _assert_counted_once(windows)
+    assert not any(name.endswith(WindowedStats.NEXT) for name in os.listdir(windows.windows_dir))
+
+
+def test_crash_after_commit_point_is_finished(feed_dir, monkeypatch):
+    windows = WindowedStats()
+    _publish_events("2030-01-01 09:15")
+    windows.update()
+    _publish_events("2030-01-01 10:00", "2030-01-03 10:00")
+    replace = os.replace
+    moved = []
+
+    def crash_after_first_rename(src, dst):
+        if src.endswith(WindowedStats.NEXT) and moved:
+            raise KeyboardInterrupt
+        replace(src, dst)
+        moved.append(dst)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", crash_after_first_rename)
+        with pytest.raises(KeyboardInterrupt):
+            windows.update()
+    assert os.path.exists(os.path.join(windows.windows_dir, WindowedStats.COMMIT))
+    assert windows.update() == 0
+    assert windows.window().records == 3
+    _assert_counted_once(windows)